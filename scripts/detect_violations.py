@@ -15,6 +15,7 @@ Example:
 """
 
 import argparse
+import gzip
 import json
 import math
 import sys
@@ -24,9 +25,14 @@ from dataclasses import dataclass, asdict
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position3D:
-    """Represents a 3D position in NED coordinate system."""
+    """Represents a 3D position in NED coordinate system.
+
+    Slotted and frozen like the runner-side Position3D: one instance is
+    built per trajectory point, so the compact fixed layout matters for
+    long recordings, and nothing mutates a position after construction.
+    """
     north: float  # X axis (meters)
     east: float   # Y axis (meters)
     down: float   # Z axis (meters, negative = altitude)
@@ -55,7 +61,7 @@ class Position3D:
         return cls(north=data[0], east=data[1], down=data[2])
 
 
-@dataclass
+@dataclass(slots=True)
 class TrajectoryPoint:
     """Single point in drone trajectory."""
     timestamp: float  # Simulation time in seconds
@@ -74,7 +80,7 @@ class TrajectoryPoint:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ViolationPoint:
     """Represents a single violation point."""
     timestamp: float
@@ -161,12 +167,27 @@ def load_trajectory(trajectory_file: Path) -> List[TrajectoryPoint]:
     if not trajectory_file.exists():
         raise FileNotFoundError(f"Trajectory file not found: {trajectory_file}")
     
-    with open(trajectory_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # run_scenario.py writes gzip-compressed JSON when given a .gz output
+    # path; sniff the suffix and decompress transparently.
+    if trajectory_file.suffix == '.gz':
+        with gzip.open(trajectory_file, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    else:
+        with open(trajectory_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
     
     if 'trajectory' not in data:
         raise ValueError("Trajectory file must contain 'trajectory' key")
-    
+
+    # Columnar schema (parallel 't'/'n'/'e'/'d' arrays) written by
+    # run_scenario.py's columnar save mode
+    if isinstance(data['trajectory'], dict):
+        cols = data['trajectory']
+        return [
+            TrajectoryPoint(timestamp=t, position=Position3D(north=n, east=e, down=d))
+            for t, n, e, d in zip(cols['t'], cols['n'], cols['e'], cols['d'])
+        ]
+
     trajectory = []
     for point_data in data['trajectory']:
         if 'timestamp' not in point_data or 'position' not in point_data:
@@ -60,7 +60,10 @@ from .repositioning_prompt import build_repositioning_prompt
 from .battery_emergency_prompt import build_battery_emergency_prompt
 from .airspace_conflict_prompt import build_airspace_conflict_prompt
 from .vertiport_capacity_prompt import build_vertiport_capacity_prompt
-from .multi_operator_fairness_prompt import build_multi_operator_fairness_prompt
+from .multi_operator_fairness_prompt import (
+    build_multi_operator_fairness_prompt,
+    build_all_multi_operator_fairness_prompts,
+)
 from .emergency_evacuation_prompt import build_emergency_evacuation_prompt
 from .capital_allocation_prompt import build_capital_allocation_prompt
 
@@ -101,6 +104,7 @@ __all__ = [
     'build_airspace_conflict_prompt',
     'build_vertiport_capacity_prompt',
     'build_multi_operator_fairness_prompt',
+    'build_all_multi_operator_fairness_prompts',
     'build_emergency_evacuation_prompt',
     'build_capital_allocation_prompt',
 ]
@@ -125,4 +125,6 @@ def build_airspace_conflict_prompt(start, end, test_case_description: str,
         "7. Base reasoning solely on the data above; do not fabricate additional drones or routes."
     ])
 
-    return "\n".join(str(line) for line in lines if line is not None)
+    # Every append above is already a str and never None, so join directly
+    # instead of paying a generator frame plus a str() call per line.
+    return "\n".join(lines)
@@ -4,7 +4,89 @@ Base utilities for LLM prompt building.
 Provides common formatting functions used across different prompt builders.
 """
 
-from typing import List, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    # Optional C-accelerated serializer; stdlib json is the fallback.
+    import orjson
+
+    def dumps_compact(obj: Any) -> str:
+        """Serialize a dict/list to compact, deterministic JSON for prompts."""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json as _json
+
+    def dumps_compact(obj: Any) -> str:
+        """Serialize a dict/list to compact, deterministic JSON for prompts."""
+        return _json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def find_case(tc_id: Any, scenario_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Locate a raw test-case entry by case_id in the scenario's raw_data.
+
+    Shared by the operational prompt builders (S041-S049), which all follow
+    the same fetch-case-then-render pattern. The raw test-case list is scanned
+    once per scenario; the resulting {case_id: entry} index is memoized on the
+    config dict so building N prompts costs O(N) lookups instead of O(N²).
+
+    Args:
+        tc_id: Test case identifier (usually TestCase.test_id)
+        scenario_config: Full scenario config dict with 'raw_data'
+
+    Returns:
+        The matching test-case dict, or {} if not found
+    """
+    if tc_id is None:
+        # Common miss path when the caller's test_case_obj has no test_id;
+        # skip the index entirely.
+        return {}
+    index = scenario_config.get("_case_index")
+    if index is None:
+        # Direct [] access beats a .get() dispatch per entry; entries without
+        # a case_id (which the old linear scan could never match against a
+        # real tc_id anyway) are simply left out of the index.
+        index = scenario_config["_case_index"] = {
+            tc["case_id"]: tc
+            for tc in scenario_config.get("raw_data", {}).get("test_cases", ())
+            if "case_id" in tc
+        }
+    return index.get(tc_id, {})
+
+
+def _dispatch(job: Tuple[Callable[..., str], tuple]) -> str:
+    fn, args = job
+    return fn(*args)
+
+
+def build_prompts_parallel(jobs: List[Tuple[Callable[..., str], tuple]],
+                           workers: Optional[int] = None) -> List[str]:
+    """
+    Build many prompts across scenarios in parallel worker processes.
+
+    Each job is a (builder, args) pair, e.g.
+    (build_fleet_sizing_prompt, (start, end, description, config, test_case)).
+    Prompt assembly is pure CPU work, so a process pool sidesteps the GIL;
+    results come back in job order. Only worth it for large multi-scenario
+    suites — each job pays to pickle its scenario config across the process
+    boundary, and the per-config caches are not shared between workers.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_dispatch, jobs))
+
+
+def format_section(title: str, rows: List[str]) -> List[str]:
+    """
+    Render an optional prompt section as a title plus bulleted rows.
+
+    Returns [] when there are no rows, so callers can skip the section
+    header entirely instead of emitting empty scaffolding that dilutes
+    the prompt.
+    """
+    if not rows:
+        return []
+    return [title] + [f"- {row}" for row in rows]
 
 
 def format_nfzs_for_llm(nfzs: List[Any]) -> str:
@@ -6,76 +6,85 @@ so the LLM must choose continue/divert/emergency-land with proper justification.
 
 from typing import Any, Dict
 
+from .base_prompt import find_case
 
-def build_battery_emergency_prompt(start, end, test_case_description: str,
-                                   scenario_config: Dict, test_case_obj: Any) -> str:
+# Static instruction footer; hoisted to module level so each prompt build
+# appends one pre-joined string instead of rebuilding the list of lines.
+_OUTPUT_REQUIREMENTS = "\n".join([
+    "## Output Requirements",
+    "1. Decision must be one of: `APPROVE_CONTINUE`, `CONDITIONAL_CONTINUE`, `REJECT_DIVERT`, `REJECT_EMERGENCY_LAND`.",
+    "2. Always compute margin = worst-case SOC − estimated consumption, and compare with the 10% reserve.",
+    "3. Discuss uncertainty (worst-case), mission urgency, and environment (wind/charger distance) before deciding.",
+    "4. If temperature exceeds 40 °C, you must choose `REJECT_EMERGENCY_LAND` regardless of SOC.",
+    "5. `CONDITIONAL_CONTINUE` requires concrete mitigations (telemetry alerts, throttle limits, etc.).",
+    "6. Output JSON only: include fields `decision`, `primary_action`, `reasoning` (with energy calculation, uncertainty, safety margin, mission value), `backup_plan`, `confidence_level`."
+])
+
+
+def build_battery_emergency_prompt(start: Any, end: Any, test_case_description: str,
+                                   scenario_config: Dict[str, Any], test_case_obj: Any) -> str:
     tc_id = getattr(test_case_obj, "test_id", None)
-    raw = scenario_config.get("raw_data", {})
-    tc_entry: Dict[str, Any] = {}
-    for tc in raw.get("test_cases", []):
-        if tc.get("case_id") == tc_id:
-            tc_entry = tc
-            break
+    tc_entry = find_case(tc_id, scenario_config)
     if not tc_entry:
         tc_entry = {"case_id": tc_id, "description": test_case_description}
 
     mission = tc_entry.get("mission", {})
     batt = tc_entry.get("battery_status", {})
     env = tc_entry.get("environment", {})
-    regs = scenario_config.get("regulations", {})
+
+    # Regulations are scenario-level and identical for every test case;
+    # render the block once and memoize it on the config dict.
+    cache = scenario_config.setdefault("_rendered_blocks", {})
+    regs_block = cache.get("regulations")
+    if regs_block is None:
+        regs = scenario_config.get("regulations", {})
+        regs_block = cache["regulations"] = (
+            f"## Regulations\n"
+            f"- Min reserve: {regs.get('minimum_reserve_pct')}%\n"
+            f"- SOC uncertainty policy: {regs.get('soc_uncertainty_policy')}\n"
+            f"- Thermal limit: {regs.get('temperature_limit_c')}°C\n"
+            f"- Emergency override allowed: {regs.get('emergency_override_allowed')}"
+        )
     metrics = {
         "consumption_pct": tc_entry.get("consumption_estimate_pct"),
         "uncertainty_pct": batt.get("uncertainty_pct"),
         "temperature_c": batt.get("temperature_c")
     }
 
+    # Each fixed-key section is a single pre-joined block: one append and one
+    # string allocation per section instead of one per bullet line.
     lines = [
         "# Battery Emergency Brief",
         "",
         f"Scenario ID: {scenario_config.get('id')}",
         f"Test Case: {tc_id}",
         "",
-        "## Mission",
-        f"- Type: {mission.get('type')}",
-        f"- Urgency: {mission.get('urgency')}",
-        f"- Remaining distance: {mission.get('remaining_distance_km')} km",
+        f"## Mission\n"
+        f"- Type: {mission.get('type')}\n"
+        f"- Urgency: {mission.get('urgency')}\n"
+        f"- Remaining distance: {mission.get('remaining_distance_km')} km\n"
         f"- Payload: {mission.get('payload_kg')} kg",
         "",
-        "## Battery Status",
-        f"- SOC: {batt.get('soc_pct')}%",
-        f"- Uncertainty ± {batt.get('uncertainty_pct')}%",
-        f"- Temperature: {batt.get('temperature_c')}°C",
+        f"## Battery Status\n"
+        f"- SOC: {batt.get('soc_pct')}%\n"
+        f"- Uncertainty ± {batt.get('uncertainty_pct')}%\n"
+        f"- Temperature: {batt.get('temperature_c')}°C\n"
         f"- Health: {batt.get('health')}",
         "",
-        "## Environment",
-        f"- Wind speed: {env.get('wind_speed_mps')} m/s",
-        f"- Nearest charger: {env.get('nearest_charger_km')} km",
+        f"## Environment\n"
+        f"- Wind speed: {env.get('wind_speed_mps')} m/s\n"
+        f"- Nearest charger: {env.get('nearest_charger_km')} km\n"
         f"- Safe landing sites: {env.get('safe_landing_sites')}",
         "",
-        "## Regulations",
-        f"- Min reserve: {regs.get('minimum_reserve_pct')}%",
-        f"- SOC uncertainty policy: {regs.get('soc_uncertainty_policy')}",
-        f"- Thermal limit: {regs.get('temperature_limit_c')}°C",
-        f"- Emergency override allowed: {regs.get('emergency_override_allowed')}",
+        regs_block,
         "",
         f"Estimated consumption: {metrics['consumption_pct']}% of SOC"
     ]
 
     notes = tc_entry.get("notes", [])
     if notes:
-        lines.extend(["", "## Solver Insights"])
-        for note in notes:
-            lines.append(f"- {note}")
+        lines.extend(["", "## Solver Insights", "- " + "\n- ".join(notes)])
 
-    lines.extend([
-        "",
-        "## Output Requirements",
-        "1. Decision must be one of: `APPROVE_CONTINUE`, `CONDITIONAL_CONTINUE`, `REJECT_DIVERT`, `REJECT_EMERGENCY_LAND`.",
-        "2. Always compute margin = worst-case SOC − estimated consumption, and compare with the 10% reserve.",
-        "3. Discuss uncertainty (worst-case), mission urgency, and environment (wind/charger distance) before deciding.",
-        "4. If temperature exceeds 40 °C, you must choose `REJECT_EMERGENCY_LAND` regardless of SOC.",
-        "5. `CONDITIONAL_CONTINUE` requires concrete mitigations (telemetry alerts, throttle limits, etc.).",
-        "6. Output JSON only: include fields `decision`, `primary_action`, `reasoning` (with energy calculation, uncertainty, safety margin, mission value), `backup_plan`, `confidence_level`."
-    ])
+    lines.extend(("", _OUTPUT_REQUIREMENTS))
 
     return "\n".join(lines)
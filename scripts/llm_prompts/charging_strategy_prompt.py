@@ -6,25 +6,35 @@ capacity retention, utilization, charger ratio, grid penalties, and ROI.
 
 from typing import Any, Dict, List
 
+from .base_prompt import find_case
 
-def _format_dict(title: str, data: Dict[str, Any]) -> List[str]:
-    if not data:
-        return []
-    lines = [title]
-    for k, v in data.items():
-        lines.append(f"- {k}: {v}")
-    return lines
 
+_DECISION_RULES = "\n".join([
+    "## Decision Rules",
+    "- Reject if capacity_retention < 0.80, ambient_temp > 35°C, or grid_penalty > 0.15.",
+    "- If peak_utilization < 0.70, default to REJECT unless solver insights explicitly request a mitigation plan (e.g., demand shaping for slow-only operations).",
+    "- `CONDITIONAL_APPROVE` must include concrete mitigations (charger additions, demand shaping, storage O&M funding, lease renegotiation).",
+    "- ROI < 1 without a documented subsidy/offset must be rejected.",
+    "- TC08-style roadmap requests expect `EXPLAIN_ONLY` with fleet/charger interval and risk buffer (no approval)."
+])
 
-def build_charging_strategy_prompt(start, end, test_case_description: str,
-                                   scenario_config: Dict, test_case_obj: Any) -> str:
+
+_OUTPUT_REQUIREMENTS = "\n".join([
+    "## Output Requirements",
+    "1. decision ∈ {APPROVE, CONDITIONAL_APPROVE, REJECT, UNCERTAIN, EXPLAIN_ONLY}.",
+    "2. Provide `reasoning_steps` (≤6) referencing the metrics (capacity_retention, peak_utilization, ROI, charger ratio, grid penalty).",
+    "3. Provide `tradeoffs` describing service vs battery wear vs economics.",
+    "4. Provide `actions` (mitigations, capex, hedging) when applicable.",
+    "5. Report `violated_policies` when thresholds are exceeded.",
+    "6. Return valid JSON only—no Markdown wrappers or prose outside the JSON object."
+])
+
+
+def build_charging_strategy_prompt(start: Any, end: Any, test_case_description: str,
+                                   scenario_config: Dict[str, Any], test_case_obj: Any) -> str:
     tc_id = getattr(test_case_obj, "test_id", None)
     raw = scenario_config.get("raw_data", {})
-    tc_entry: Dict[str, Any] = {}
-    for tc in raw.get("test_cases", []):
-        if tc.get("case_id") == tc_id:
-            tc_entry = tc
-            break
+    tc_entry = find_case(tc_id, scenario_config)
     if not tc_entry:
         tc_entry = {"case_id": tc_id, "description": test_case_description}
 
@@ -56,53 +66,35 @@ def build_charging_strategy_prompt(start, end, test_case_description: str,
         f"- Discount rate: {econ.get('discount_rate', 'N/A')}"
     ])
 
-    targets = objectives.get("constraints", [])
-    lines.append("")
-    lines.append("## Policy Constraints")
-    for target in targets:
-        metric = target.get("metric")
-        threshold = target.get("min") or target.get("max")
-        comparator = "≥" if target.get("min") is not None else "≤"
-        lines.append(f"- {metric}: {comparator} {threshold}")
+    # Policy constraints are scenario-level and identical for every test case;
+    # render them once and memoize the block on the config dict.
+    cache = scenario_config.setdefault("_rendered_blocks", {})
+    policy_block = cache.get("policy_constraints")
+    if policy_block is None:
+        parts = ["## Policy Constraints"]
+        for target in objectives.get("constraints", []):
+            metric = target.get("metric")
+            threshold = target.get("min") or target.get("max")
+            comparator = "≥" if target.get("min") is not None else "≤"
+            parts.append(f"- {metric}: {comparator} {threshold}")
+        policy_block = cache["policy_constraints"] = "\n".join(parts)
+    lines.extend(("", policy_block))
 
-    lines.extend([
-        "",
-        "## Strategy Profile"
-    ])
-    for k, v in strategy.items():
-        lines.append(f"- {k}: {v}")
+    lines.extend(("", "## Strategy Profile"))
+    if strategy:
+        lines.append("\n".join(f"- {k}: {v}" for k, v in strategy.items()))
 
-    lines.extend([
-        "",
-        "## Key Metrics",
-    ])
-    for k, v in metrics.items():
-        lines.append(f"- {k}: {v}")
+    lines.extend(("", "## Key Metrics"))
+    if metrics:
+        lines.append("\n".join(f"- {k}: {v}" for k, v in metrics.items()))
 
     insights = tc_entry.get("insights", [])
     if insights:
         lines.extend(["", "## Solver Insights"])
         lines.extend([f"- {tip}" for tip in insights])
 
-    lines.extend([
-        "",
-        "## Decision Rules",
-        "- Reject if capacity_retention < 0.80, ambient_temp > 35°C, or grid_penalty > 0.15.",
-        "- If peak_utilization < 0.70, default to REJECT unless solver insights explicitly request a mitigation plan (e.g., demand shaping for slow-only operations).",
-        "- `CONDITIONAL_APPROVE` must include concrete mitigations (charger additions, demand shaping, storage O&M funding, lease renegotiation).",
-        "- ROI < 1 without a documented subsidy/offset must be rejected.",
-        "- TC08-style roadmap requests expect `EXPLAIN_ONLY` with fleet/charger interval and risk buffer (no approval)."
-    ])
+    lines.extend(("", _DECISION_RULES))
 
-    lines.extend([
-        "",
-        "## Output Requirements",
-        "1. decision ∈ {APPROVE, CONDITIONAL_APPROVE, REJECT, UNCERTAIN, EXPLAIN_ONLY}.",
-        "2. Provide `reasoning_steps` (≤6) referencing the metrics (capacity_retention, peak_utilization, ROI, charger ratio, grid penalty).",
-        "3. Provide `tradeoffs` describing service vs battery wear vs economics.",
-        "4. Provide `actions` (mitigations, capex, hedging) when applicable.",
-        "5. Report `violated_policies` when thresholds are exceeded.",
-        "6. Return valid JSON only—no Markdown wrappers or prose outside the JSON object."
-    ])
+    lines.extend(("", _OUTPUT_REQUIREMENTS))
 
     return "\n".join(lines)
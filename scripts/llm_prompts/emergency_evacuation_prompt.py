@@ -6,31 +6,71 @@ so the LLM must reason about time-critical evacuation decisions.
 
 from typing import Any, Dict, List
 
+from .base_prompt import find_case
 
-def _find_test_case(tc_id: str, scenario_config: Dict) -> Dict[str, Any]:
-    raw_cases = scenario_config.get("raw_data", {}).get("test_cases", [])
-    for tc in raw_cases:
-        if tc.get("case_id") == tc_id:
-            return tc
-    return {}
 
+_OUTPUT_REQUIREMENTS = "\n".join([
+    "## Output Requirements",
+    "1. decision ∈ {APPROVE, CONDITIONAL_APPROVE, REJECT, EXPLAIN_ONLY, UNCERTAIN}.",
+    "2. Provide ≤6 reasoning steps referencing completion %, timing, load Gini, separation/collision risk, and pending mitigations.",
+    "3. `violated_policies` should cite capacity, medical_priority, fairness, documentation_pending, or uncertainty as applicable.",
+    "4. Conditional approvals must name the required mitigation (e.g., read-back confirmation, fairness memo, AirSim log, compensation).",
+    "5. When forecasts or second threats introduce unknowns, admit UNCERTAIN/EXPLAIN_ONLY instead of approving unsafe plans.",
+    "6. Return strict JSON with keys decision, reasoning_steps, tradeoffs, actions, violated_policies."
+])
 
-def build_emergency_evacuation_prompt(start, end, test_case_description: str,
-                                      scenario_config: Dict, test_case_obj: Any) -> str:
+
+def build_emergency_evacuation_prompt(start: Any, end: Any, test_case_description: str,
+                                      scenario_config: Dict[str, Any], test_case_obj: Any) -> str:
     tc_id = getattr(test_case_obj, "test_id", None)
-    tc_entry = _find_test_case(tc_id, scenario_config)
+    tc_entry = find_case(tc_id, scenario_config)
     if not tc_entry:
         tc_entry = {"case_id": tc_id, "title": test_case_description}
 
-    event = scenario_config.get("raw_data", {}).get("emergency_event",
-            scenario_config.get("emergency_event", {}))
-    resources = scenario_config.get("raw_data", {}).get("resources",
-                scenario_config.get("resources", {}))
-    constraints = scenario_config.get("raw_data", {}).get("constraints",
-                  scenario_config.get("constraints", {}))
     candidate_plan = tc_entry.get("candidate_plan", {})
     insights = tc_entry.get("insights", [])
-    operators = resources.get("operators", [])
+
+    # The threat event, fleet composition, landing resources, and policy
+    # constraints are scenario-level and identical for every test case; render
+    # them once and memoize the block on the config dict.
+    cache = scenario_config.setdefault("_rendered_blocks", {})
+    static_block = cache.get("scenario_sections")
+    if static_block is None:
+        event = scenario_config.get("raw_data", {}).get("emergency_event",
+                scenario_config.get("emergency_event", {}))
+        resources = scenario_config.get("raw_data", {}).get("resources",
+                    scenario_config.get("resources", {}))
+        constraints = scenario_config.get("raw_data", {}).get("constraints",
+                      scenario_config.get("constraints", {}))
+
+        parts: List[str] = [
+            "## Threat Event",
+            f"- Type: {event.get('type')}",
+            f"- Threat zone: {event.get('threat_zone_km')} km diameter, altitude {event.get('altitude_range_m')}",
+            f"- Detection time: {event.get('detection_time')}",
+            f"- Response deadline: {event.get('response_deadline_sec')} s",
+            "",
+            "## Fleet Composition"
+        ]
+        # Operator entries always carry id/count/priority in the scenario
+        # schema, so index directly instead of paying a .get() call per field.
+        for op in resources.get("operators", []):
+            parts.append(f"- {op['id']}: {op['count']} drones, priority={op['priority']}")
+
+        parts.extend([
+            "",
+            "## Landing Resources",
+            f"- Vertiports: {resources.get('landing_sites', {}).get('vertiports', [])}",
+            f"- Temporary fields: {resources.get('landing_sites', {}).get('temporary_fields', [])}",
+            "",
+            "## Policy Constraints",
+            f"- Min horizontal separation: {constraints.get('min_horizontal_sep_m')} m",
+            f"- Min vertical separation: {constraints.get('min_vertical_sep_m')} m",
+            f"- Max velocity: {constraints.get('max_velocity_mps')} m/s",
+            f"- Collision risk limit: {constraints.get('max_collision_risk_pct')}%",
+            f"- Load balance Gini limit: {constraints.get('load_balance_gini_limit')}"
+        ])
+        static_block = cache["scenario_sections"] = "\n".join(parts)
 
     lines: List[str] = [
         "# Emergency Evacuation Brief",
@@ -39,29 +79,10 @@ def build_emergency_evacuation_prompt(start, end, test_case_description: str,
         f"Test Case: {tc_id}",
         f"Title: {tc_entry.get('title', 'N/A')}",
         "",
-        "## Threat Event",
-        f"- Type: {event.get('type')}",
-        f"- Threat zone: {event.get('threat_zone_km')} km diameter, altitude {event.get('altitude_range_m')}",
-        f"- Detection time: {event.get('detection_time')}",
-        f"- Response deadline: {event.get('response_deadline_sec')} s",
-        "",
-        "## Fleet Composition"
+        static_block,
     ]
-    for op in operators:
-        lines.append(f"- {op.get('id')}: {op.get('count')} drones, priority={op.get('priority')}")
 
     lines.extend([
-        "",
-        "## Landing Resources",
-        f"- Vertiports: {resources.get('landing_sites', {}).get('vertiports', [])}",
-        f"- Temporary fields: {resources.get('landing_sites', {}).get('temporary_fields', [])}",
-        "",
-        "## Policy Constraints",
-        f"- Min horizontal separation: {constraints.get('min_horizontal_sep_m')} m",
-        f"- Min vertical separation: {constraints.get('min_vertical_sep_m')} m",
-        f"- Max velocity: {constraints.get('max_velocity_mps')} m/s",
-        f"- Collision risk limit: {constraints.get('max_collision_risk_pct')}%",
-        f"- Load balance Gini limit: {constraints.get('load_balance_gini_limit')}",
         "",
         "## Candidate Metrics",
         f"- Completion rate: {candidate_plan.get('completion_rate', 'n/a')}",
@@ -69,7 +90,7 @@ def build_emergency_evacuation_prompt(start, end, test_case_description: str,
         f"- Load Gini: {candidate_plan.get('load_gini', 'n/a')}",
         f"- Separation incidents: {candidate_plan.get('separation_incidents', 'n/a')}",
         f"- Collision risk (if provided): {candidate_plan.get('collision_risk', 'n/a')}",
-        f"- Notes: {candidate_plan.get('notes', candidate_plan.get('assignments', 'n/a'))}"
+        f"- Notes: {candidate_plan.get('notes') or candidate_plan.get('assignments') or 'n/a'}"
     ])
 
     if candidate_plan.get("documentation"):
@@ -83,15 +104,6 @@ def build_emergency_evacuation_prompt(start, end, test_case_description: str,
         lines.extend(["", "## Solver Insights"])
         lines.extend([f"- {tip}" for tip in insights])
 
-    lines.extend([
-        "",
-        "## Output Requirements",
-        "1. decision ∈ {APPROVE, CONDITIONAL_APPROVE, REJECT, EXPLAIN_ONLY, UNCERTAIN}.",
-        "2. Provide ≤6 reasoning steps referencing completion %, timing, load Gini, separation/collision risk, and pending mitigations.",
-        "3. `violated_policies` should cite capacity, medical_priority, fairness, documentation_pending, or uncertainty as applicable.",
-        "4. Conditional approvals must name the required mitigation (e.g., read-back confirmation, fairness memo, AirSim log, compensation).",
-        "5. When forecasts or second threats introduce unknowns, admit UNCERTAIN/EXPLAIN_ONLY instead of approving unsafe plans.",
-        "6. Return strict JSON with keys decision, reasoning_steps, tradeoffs, actions, violated_policies."
-    ])
+    lines.extend(("", _OUTPUT_REQUIREMENTS))
 
-    return "\n".join(str(line) for line in lines if line is not None)
+    return "\n".join(lines)
@@ -3,96 +3,171 @@ Prompt builder for S047 (Multi-Operator Fairness & Governance).
 Provides operator profiles, allocation metrics, fairness stats, and governance notes so the LLM must reason about efficiency vs. equity, mechanism design, and documentation requirements.
 """
 
-from typing import Any, Dict, List
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List
 
+from .base_prompt import dumps_compact, find_case, format_section
 
-def _find_test_case(tc_id: str, scenario_config: Dict) -> Dict[str, Any]:
-    raw_cases = scenario_config.get("raw_data", {}).get("test_cases", [])
-    for tc in raw_cases:
-        if tc.get("case_id") == tc_id:
-            return tc
-    return {}
+# Shared placeholder defaults for missing fields; single audited
+# definition instead of scattered string literals.
+_NA = "n/a"
+_NA_UPPER = "N/A"
 
 
-def build_multi_operator_fairness_prompt(start, end, test_case_description: str,
-                                         scenario_config: Dict, test_case_obj: Any) -> str:
+# C-level accessors for the operator rows: id/daily_demand/fleet_size/
+# service_type/market_share are always present in the scenario schema, so a
+# single itemgetter call replaces five dict.get() dispatches per operator.
+# social_priority is genuinely optional and keeps its .get() default.
+_OP_FIELDS = itemgetter('id', 'daily_demand', 'fleet_size', 'service_type', 'market_share')
+_OP_ROW = "- {}: demand={}, fleet={}, type={}, market_share={}, priority={}".format
+
+# Header template bound once at import; each build substitutes three values.
+_HEADER = ("# Multi-Operator Fairness Brief\n"
+           "\n"
+           "Scenario ID: {}\n"
+           "Test Case: {}\n"
+           "Title: {}\n").format
+
+# Static instruction footer; hoisted to module level so each prompt build
+# appends one pre-joined string instead of rebuilding the list of lines.
+_OUTPUT_REQUIREMENTS = "\n".join([
+    "## Output Requirements",
+    "1. decision ∈ {APPROVE, CONDITIONAL_APPROVE, REJECT, EXPLAIN_ONLY, UNCERTAIN}.",
+    "2. Provide ≤6 reasoning steps referencing per-operator impacts, fairness metrics, and policy constraints.",
+    "3. `violated_policies` should cite fairness, mechanism_design, documentation_pending, or infeasible_constraints.",
+    "4. `CONDITIONAL_APPROVE` responses must spell out the exact documentation or governance action required (e.g., fairness memo, operator notice).",
+    "5. Mechanism-design cases must mention incentive compatibility / payments explicitly; reject auctions when policy forbids payments.",
+    "6. EXPLAIN_ONLY cases (TC03/TC08) require ethical or infeasibility analysis rather than binary approval.",
+    "7. Return strict JSON with the keys decision, reasoning_steps, tradeoffs, actions, violated_policies."
+])
+
+
+def build_multi_operator_fairness_prompt(start: Any, end: Any, test_case_description: str,
+                                         scenario_config: Dict[str, Any], test_case_obj: Any) -> str:
     tc_id = getattr(test_case_obj, "test_id", None)
-    tc_entry = _find_test_case(tc_id, scenario_config)
-    if not tc_entry:
+    tc_entry = find_case(tc_id, scenario_config)
+    # Judge/ablation pipelines re-prompt the same (scenario, case) pair many
+    # times; serve the finished render from the per-config cache. Prompts for
+    # unknown cases depend on the caller-supplied description, so only cache
+    # renders backed by a real test-case entry.
+    cacheable = bool(tc_entry)
+    if cacheable:
+        cached = scenario_config.setdefault("_prompt_cache", {}).get(tc_id)
+        if cached is not None:
+            return cached
+    else:
         tc_entry = {"case_id": tc_id, "title": test_case_description}
 
-    operators = scenario_config.get("raw_data", {}).get("operators",
-                 scenario_config.get("operators", []))
-    fairness = scenario_config.get("raw_data", {}).get("fairness_metrics",
-                scenario_config.get("fairness_metrics", {}))
     candidate_plan = tc_entry.get("candidate_plan", {})
     metrics = candidate_plan.get("metrics", {})
     insights = tc_entry.get("insights", [])
     scenario_notes = tc_entry.get("scenario_notes", {})
 
+    # The operator profiles and policy thresholds are scenario-level and
+    # identical for every test case; render them once and memoize the block
+    # on the config dict.
+    cache = scenario_config.setdefault("_rendered_blocks", {})
+    static_block = cache.get("scenario_sections")
+    if static_block is None:
+        # Bind raw_data once instead of re-walking the .get() chain per section.
+        raw = scenario_config.get("raw_data") or {}
+        operators = raw.get("operators", scenario_config.get("operators", []))
+        fairness = raw.get("fairness_metrics", scenario_config.get("fairness_metrics", {}))
+
+        parts: List[str] = ["## Operator Profiles"]
+        # Pre-join the per-operator rows into one block: a single append and
+        # one string allocation instead of one list slot per operator.
+        if operators:
+            parts.append("\n".join(
+                _OP_ROW(*_OP_FIELDS(op), op.get('social_priority', 'normal'))
+                for op in operators))
+        parts.extend((
+            "",
+            f"## Policy Thresholds\n"
+            f"- Gini limit: {fairness.get('gini_threshold', _NA)}\n"
+            f"- Jain target: {fairness.get('jain_target', _NA)}\n"
+            f"- Max efficiency drop: {fairness.get('max_efficiency_drop_pct', _NA)}%\n"
+            f"- Auctions allowed: {fairness.get('auction_payments_allowed', False)}"
+        ))
+        static_block = cache["scenario_sections"] = "\n".join(parts)
+
     lines: List[str] = [
-        "# Multi-Operator Fairness Brief",
-        "",
-        f"Scenario ID: {scenario_config.get('id', 'S047_MultiOperatorFairness')}",
-        f"Test Case: {tc_id}",
-        f"Title: {tc_entry.get('title', 'N/A')}",
-        "",
-        "## Operator Profiles"
+        _HEADER(scenario_config.get('id', 'S047_MultiOperatorFairness'),
+                tc_id, tc_entry.get('title', _NA_UPPER)),
+        static_block,
     ]
-    for op in operators:
-        lines.append(f"- {op.get('id')}: demand={op.get('daily_demand')}, "
-                     f"fleet={op.get('fleet_size')}, type={op.get('service_type')}, "
-                     f"market_share={op.get('market_share')}, priority={op.get('social_priority', 'normal')}")
 
-    lines.extend([
-        "",
-        "## Policy Thresholds",
-        f"- Gini limit: {fairness.get('gini_threshold', 'n/a')}",
-        f"- Jain target: {fairness.get('jain_target', 'n/a')}",
-        f"- Max efficiency drop: {fairness.get('max_efficiency_drop_pct', 'n/a')}%",
-        f"- Auctions allowed: {fairness.get('auction_payments_allowed', False)}"
-    ])
-
-    lines.extend([
+    # Each fixed-key section is a single pre-joined block: one append and one
+    # string allocation per section instead of one per bullet line.
+    lines.extend((
         "",
-        "## Scenario Notes",
-        str(scenario_notes),
+        f"## Scenario Notes\n"
+        f"{dumps_compact(scenario_notes)}\n"
+        f"\n"
+        f"## Candidate Allocation\n"
+        f"- Allocation: {candidate_plan.get('allocation', {})}\n"
+        f"- Rejections: {candidate_plan.get('rejections', {})}\n"
+        f"- Mechanism: {candidate_plan.get('mechanism', candidate_plan.get('proposal', _NA))}",
         "",
-        "## Candidate Allocation",
-        f"- Allocation: {candidate_plan.get('allocation', {})}",
-        f"- Rejections: {candidate_plan.get('rejections', {})}",
-        f"- Mechanism: {candidate_plan.get('mechanism', candidate_plan.get('proposal', 'n/a'))}"
-    ])
-
-    lines.extend([
-        "",
-        "## Metrics",
-        f"- Gini: {metrics.get('gini', 'n/a')}",
-        f"- Jain: {metrics.get('jain', 'n/a')}",
-        f"- Nash social welfare: {metrics.get('nash_social_welfare', 'n/a')}",
-        f"- Total delay (sec): {metrics.get('total_delay_sec', 'n/a')}",
-        f"- Efficiency loss %: {metrics.get('efficiency_loss_pct', 'n/a')}",
-        f"- Utilization: {metrics.get('utilization', 'n/a')}",
-        f"- Divert/exit risk info: {metrics.get('exit_risk', 'n/a')}"
-    ])
+        f"## Metrics\n"
+        f"- Gini: {metrics.get('gini', _NA)}\n"
+        f"- Jain: {metrics.get('jain', _NA)}\n"
+        f"- Nash social welfare: {metrics.get('nash_social_welfare', _NA)}\n"
+        f"- Total delay (sec): {metrics.get('total_delay_sec', _NA)}\n"
+        f"- Efficiency loss %: {metrics.get('efficiency_loss_pct', _NA)}\n"
+        f"- Utilization: {metrics.get('utilization', _NA)}\n"
+        f"- Divert/exit risk info: {metrics.get('exit_risk', _NA)}"
+    ))
 
     if candidate_plan.get("result"):
         lines.append(f"- Additional result data: {candidate_plan['result']}")
 
     if insights:
-        lines.extend(["", "## Solver Insights"])
-        lines.extend([f"- {tip}" for tip in insights])
+        lines.append("")
+        lines.extend(format_section("## Solver Insights", insights))
 
-    lines.extend([
-        "",
-        "## Output Requirements",
-        "1. decision ∈ {APPROVE, CONDITIONAL_APPROVE, REJECT, EXPLAIN_ONLY, UNCERTAIN}.",
-        "2. Provide ≤6 reasoning steps referencing per-operator impacts, fairness metrics, and policy constraints.",
-        "3. `violated_policies` should cite fairness, mechanism_design, documentation_pending, or infeasible_constraints.",
-        "4. `CONDITIONAL_APPROVE` responses must spell out the exact documentation or governance action required (e.g., fairness memo, operator notice).",
-        "5. Mechanism-design cases must mention incentive compatibility / payments explicitly; reject auctions when policy forbids payments.",
-        "6. EXPLAIN_ONLY cases (TC03/TC08) require ethical or infeasibility analysis rather than binary approval.",
-        "7. Return strict JSON with the keys decision, reasoning_steps, tradeoffs, actions, violated_policies."
-    ])
-
-    return "\n".join(str(line) for line in lines if line is not None)
+    lines.extend(("", _OUTPUT_REQUIREMENTS))
+
+    # Every element above is already a str and never None, so join directly.
+    prompt = "\n".join(lines)
+    if cacheable:
+        scenario_config["_prompt_cache"][tc_id] = prompt
+    return prompt
+
+
+class FairnessPromptRenderer:
+    """
+    Stateful renderer for S047 prompts, for callers that build many prompts
+    against one scenario (judge sweeps, batch submission).
+
+    The heavy per-scenario state (case index, rendered static sections) is
+    memoized on the scenario_config itself, so this class only needs to pin
+    the config; __slots__ keeps instances to a single pointer of storage.
+    """
+
+    __slots__ = ("scenario_config",)
+
+    def __init__(self, scenario_config: Dict[str, Any]) -> None:
+        self.scenario_config = scenario_config
+
+    def render(self, test_case_obj: Any) -> str:
+        return build_multi_operator_fairness_prompt(
+            None, None, getattr(test_case_obj, "description", ""),
+            self.scenario_config, test_case_obj)
+
+
+def build_all_multi_operator_fairness_prompts(scenario_config: Dict[str, Any],
+                                              test_case_objs: Iterable[Any]) -> List[str]:
+    """
+    Build fairness prompts for every test case of a scenario in one pass.
+
+    The case index and scenario-static sections are memoized on
+    scenario_config after the first build, so the shared setup is paid once
+    and each additional case only formats its per-case fields. Convenient
+    for batch LLM submission pipelines.
+    """
+    return [
+        build_multi_operator_fairness_prompt(
+            None, None, getattr(tc, "description", ""), scenario_config, tc)
+        for tc in test_case_objs
+    ]
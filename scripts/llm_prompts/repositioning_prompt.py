@@ -4,49 +4,105 @@ Feeds demand phase, fleet distribution, metrics, and solver insights so the LLM
 can reason about proactive staging, reactive rebalance costs, and mitigation plans.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
+from .base_prompt import find_case, format_section
 
-def _format_section(title: str, rows: List[str]) -> List[str]:
-    if not rows:
-        return []
-    return [title] + [f"- {row}" for row in rows]
+# Shared placeholder defaults for missing fields; single audited
+# definition instead of scattered string literals.
+_NA_UPPER = "N/A"
 
 
-def build_repositioning_prompt(start, end, test_case_description: str,
-                               scenario_config: Dict, test_case_obj: Any) -> str:
+# (metrics key, display label) rows that only appear when present; a module
+# tuple so the table is not re-allocated on every call.
+_OPTIONAL_METRICS: Tuple[Tuple[str, str], ...] = (
+    ("spill_pct", "Spill %"),
+    ("battery_soc_recovered_pct", "SOC recovered %"),
+    ("delay_minutes", "Delay minutes"),
+    ("rl_profit_usd", "RL profit"),
+    ("llm_plan_profit_usd", "LLM plan profit"),
+    ("recommendation_window", "Recommended rolling horizon")
+)
+
+
+# Static guidance/footer text; hoisted to module level so each prompt build
+# appends two pre-joined strings instead of rebuilding the lists of lines.
+_DECISION_GUIDANCE = "\n".join([
+    "## Decision Guidance",
+    "- Targets (reference only): avg_wait ≈ 5 min, empty-leg % ≈ 15%, utilization ≈ 0.70, justify reposition costs > $150.",
+    "- When metrics conflict (e.g., low wait but sub-0.70 utilization), weigh trade-offs and cite mitigation commitments if you still approve.",
+    "- Charging more than ~30% of the fleet simultaneously can be acceptable only if a coverage plan is documented; otherwise waits may override low empty-leg percentages.",
+    "- Weather/closure scenarios: higher empty legs may be tolerated if compensation/buffer plans are articulated, but regulators scrutinize added buffer costs.",
+    "- TC08 is advisory: compare RL vs LLM metrics and recommend an improved rolling-horizon dispatch strategy."
+])
+
+
+_OUTPUT_REQUIREMENTS = "\n".join([
+    "## Output Requirements",
+    "1. decision ∈ {APPROVE, CONDITIONAL_APPROVE, REJECT, UNCERTAIN, EXPLAIN_ONLY}.",
+    "2. Provide `reasoning_steps` (≤6) referencing wait time, empty-leg %, utilization, and reposition cost.",
+    "3. Provide `tradeoffs` describing service quality vs cost vs battery/charging opportunity.",
+    "4. Provide `actions` (e.g., surge pricing, staggered charging, passenger compensation, rolling horizon plan).",
+    "5. List `violated_policies` or conditions that require mitigation.",
+    "6. Return valid JSON only (no Markdown wrappers/prose)."
+])
+
+
+# Demand-window row template bound once at import; each row substitutes
+# five values through C-implemented str.format instead of an f-string build.
+_DEMAND_ROW = "- {}: {} | CBD→APT {} req/h, APT→CBD {} req/h (imbalance {})".format
+
+# Header template bound once at import; each build substitutes three values.
+_HEADER = ("# Peak/Valley Repositioning Brief\n"
+           "\n"
+           "Scenario ID: {}\n"
+           "Test Case: {}\n"
+           "Phase: {}\n").format
+
+
+def build_repositioning_prompt(start: Any, end: Any, test_case_description: str,
+                               scenario_config: Dict[str, Any], test_case_obj: Any) -> str:
     tc_id = getattr(test_case_obj, "test_id", None)
     raw = scenario_config.get("raw_data", {})
-    tc_entry: Dict[str, Any] = {}
-    for tc in raw.get("test_cases", []):
-        if tc.get("case_id") == tc_id:
-            tc_entry = tc
-            break
-    if not tc_entry:
+    tc_entry = find_case(tc_id, scenario_config)
+    # Judge/ablation pipelines re-prompt the same (scenario, case) pair many
+    # times; serve the finished render from the per-config cache. Prompts for
+    # unknown cases depend on the caller-supplied description, so only cache
+    # renders backed by a real test-case entry.
+    cacheable = bool(tc_entry)
+    if cacheable:
+        cached = scenario_config.setdefault("_prompt_cache", {}).get(tc_id)
+        if cached is not None:
+            return cached
+    else:
         tc_entry = {"case_id": tc_id, "description": test_case_description}
 
-    demand_profile = raw.get("demand_profile", {})
     metrics = tc_entry.get("metrics", {})
     fleet = tc_entry.get("fleet_distribution", {})
-    strategy = tc_entry.get("strategy", "N/A")
+    strategy = tc_entry.get("strategy", _NA_UPPER)
+
+    # The demand windows are scenario-level and identical for every test
+    # case; render them once and memoize the block on the config dict.
+    cache = scenario_config.setdefault("_rendered_blocks", {})
+    demand_block = cache.get("demand_windows")
+    if demand_block is None:
+        demand_block = cache["demand_windows"] = "\n".join(
+            ["## Demand Windows"] + [
+                _DEMAND_ROW(label, info.get("window"), info.get("CBD_to_Airport"),
+                            info.get("Airport_to_CBD"), info.get("imbalance_ratio"))
+                for label, info in raw.get("demand_profile", {}).items()
+            ])
 
     lines: List[str] = [
-        "# Peak/Valley Repositioning Brief",
-        "",
-        f"Scenario ID: {scenario_config.get('id')}",
-        f"Test Case: {tc_id}",
-        f"Phase: {tc_entry.get('phase', 'N/A')}",
-        "",
-        "## Demand Windows"
+        _HEADER(scenario_config.get('id'), tc_id, tc_entry.get('phase', _NA_UPPER)),
+        demand_block
     ]
-    for label, info in demand_profile.items():
-        lines.append(f"- {label}: {info.get('window')} | CBD→APT {info.get('CBD_to_Airport')} req/h, APT→CBD {info.get('Airport_to_CBD')} req/h (imbalance {info.get('imbalance_ratio')})")
 
     lines.extend([
         "",
         "## Current Fleet Distribution",
-        f"- CBD aircraft: {fleet.get('CBD', 'N/A')}",
-        f"- Airport aircraft: {fleet.get('Airport', 'N/A')}"
+        f"- CBD aircraft: {fleet.get('CBD', _NA_UPPER)}",
+        f"- Airport aircraft: {fleet.get('Airport', _NA_UPPER)}"
     ])
 
     lines.extend([
@@ -58,46 +114,25 @@ def build_repositioning_prompt(start, end, test_case_description: str,
     lines.extend([
         "",
         "## Key Metrics",
-        f"- Avg wait (min): {metrics.get('avg_wait', 'N/A')}",
-        f"- Empty-leg %: {metrics.get('empty_leg_pct', 'N/A')}",
-        f"- Utilization: {metrics.get('utilization', 'N/A')}",
-        f"- Reposition cost (USD): {metrics.get('reposition_cost', metrics.get('reposition_cost_usd', 'N/A'))}"
+        f"- Avg wait (min): {metrics.get('avg_wait', _NA_UPPER)}",
+        f"- Empty-leg %: {metrics.get('empty_leg_pct', _NA_UPPER)}",
+        f"- Utilization: {metrics.get('utilization', _NA_UPPER)}",
+        f"- Reposition cost (USD): {metrics.get('reposition_cost', metrics.get('reposition_cost_usd', _NA_UPPER))}"
     ])
 
-    optional_metrics = [
-        ("spill_pct", "Spill %"),
-        ("battery_soc_recovered_pct", "SOC recovered %"),
-        ("delay_minutes", "Delay minutes"),
-        ("rl_profit_usd", "RL profit"),
-        ("llm_plan_profit_usd", "LLM plan profit"),
-        ("recommendation_window", "Recommended rolling horizon")
-    ]
-    for key, label in optional_metrics:
-        if key in metrics:
-            lines.append(f"- {label}: {metrics[key]}")
+    opt_block = "\n".join(f"- {label}: {metrics[key]}"
+                          for key, label in _OPTIONAL_METRICS if key in metrics)
+    if opt_block:
+        lines.append(opt_block)
 
     insights = tc_entry.get("insights", [])
-    lines.extend(_format_section("## Solver Insights", insights))
+    lines.extend(format_section("## Solver Insights", insights))
 
-    lines.extend([
-        "",
-        "## Decision Guidance",
-        "- Targets (reference only): avg_wait ≈ 5 min, empty-leg % ≈ 15%, utilization ≈ 0.70, justify reposition costs > $150.",
-        "- When metrics conflict (e.g., low wait but sub-0.70 utilization), weigh trade-offs and cite mitigation commitments if you still approve.",
-        "- Charging more than ~30% of the fleet simultaneously can be acceptable only if a coverage plan is documented; otherwise waits may override low empty-leg percentages.",
-        "- Weather/closure scenarios: higher empty legs may be tolerated if compensation/buffer plans are articulated, but regulators scrutinize added buffer costs.",
-        "- TC08 is advisory: compare RL vs LLM metrics and recommend an improved rolling-horizon dispatch strategy."
-    ])
+    lines.extend(("", _DECISION_GUIDANCE))
 
-    lines.extend([
-        "",
-        "## Output Requirements",
-        "1. decision ∈ {APPROVE, CONDITIONAL_APPROVE, REJECT, UNCERTAIN, EXPLAIN_ONLY}.",
-        "2. Provide `reasoning_steps` (≤6) referencing wait time, empty-leg %, utilization, and reposition cost.",
-        "3. Provide `tradeoffs` describing service quality vs cost vs battery/charging opportunity.",
-        "4. Provide `actions` (e.g., surge pricing, staggered charging, passenger compensation, rolling horizon plan).",
-        "5. List `violated_policies` or conditions that require mitigation.",
-        "6. Return valid JSON only (no Markdown wrappers/prose)."
-    ])
+    lines.extend(("", _OUTPUT_REQUIREMENTS))
 
-    return "\n".join(lines)
+    prompt = "\n".join(lines)
+    if cacheable:
+        scenario_config["_prompt_cache"][tc_id] = prompt
+    return prompt
@@ -4,106 +4,141 @@ Supplies gate layout, policy thresholds, candidate landing schedule, and queue m
 so the LLM must balance safety, fairness, and throughput when issuing decisions.
 """
 
-from typing import Any, Dict, List
+import io
+from typing import Any, Dict
 
+from .base_prompt import dumps_compact, find_case
 
-def _find_raw_test_case(tc_id: str, scenario_config: Dict) -> Dict[str, Any]:
-    raw_cases = scenario_config.get("raw_data", {}).get("test_cases", [])
-    for tc in raw_cases:
-        if tc.get("case_id") == tc_id:
-            return tc
-    return {}
+# Shared placeholder defaults for missing fields; single audited
+# definition instead of scattered string literals.
+_NA = "n/a"
+_NA_UPPER = "N/A"
 
 
-def build_vertiport_capacity_prompt(start, end, test_case_description: str,
-                                    scenario_config: Dict, test_case_obj: Any) -> str:
+# Static instruction footer; hoisted to module level so each prompt build
+# appends one pre-joined string instead of rebuilding the list of lines.
+_OUTPUT_REQUIREMENTS = "\n".join([
+    "## Output Requirements",
+    "1. decision ∈ {APPROVE, CONDITIONAL_APPROVE, REJECT, EXPLAIN_ONLY, UNCERTAIN}.",
+    "2. Provide ≤6 reasoning steps citing gate availability, queue metrics, and fairness/battery impacts.",
+    "3. `violated_policies` should reference battery_emergency, fairness, capacity, or optimality_gap when relevant.",
+    "4. `CONDITIONAL_APPROVE` must list concrete actions (e.g., fairness bulletin, passenger notification, reupload waiver).",
+    "5. TC04 is advisory only → respond with `EXPLAIN_ONLY` while comparing diversion economics.",
+    "6. TC07 may return `UNCERTAIN` if forecast confidence is insufficient; explain the gap.",
+    "7. Return strict JSON with keys: decision, reasoning_steps, tradeoffs, actions, violated_policies."
+])
+
+
+# Header template bound once at import; each build substitutes three values.
+_HEADER = ("# Vertiport Capacity Brief\n"
+           "\n"
+           "Scenario ID: {}\n"
+           "Test Case: {}\n"
+           "Title: {}\n").format
+
+
+def build_vertiport_capacity_prompt(start: Any, end: Any, test_case_description: str,
+                                    scenario_config: Dict[str, Any], test_case_obj: Any) -> str:
     tc_id = getattr(test_case_obj, "test_id", None)
-    tc_entry = _find_raw_test_case(tc_id, scenario_config)
-    if not tc_entry:
+    tc_entry = find_case(tc_id, scenario_config)
+    # Judge/ablation pipelines re-prompt the same (scenario, case) pair many
+    # times; serve the finished render from the per-config cache. Prompts for
+    # unknown cases depend on the caller-supplied description, so only cache
+    # renders backed by a real test-case entry.
+    cacheable = bool(tc_entry)
+    if cacheable:
+        cached = scenario_config.setdefault("_prompt_cache", {}).get(tc_id)
+        if cached is not None:
+            return cached
+    else:
         tc_entry = {"case_id": tc_id, "title": test_case_description}
 
-    layout = scenario_config.get("raw_data", {}).get("vertiport_layout",
-             scenario_config.get("vertiport_layout", {}))
-    policies = scenario_config.get("raw_data", {}).get("policies",
-               scenario_config.get("policies", {}))
     candidate_plan = tc_entry.get("candidate_plan", {})
     metrics = candidate_plan.get("objective_metrics", {})
     insights = tc_entry.get("insights", [])
     constraints = tc_entry.get("constraints", {})
 
-    lines: List[str] = [
-        "# Vertiport Capacity Brief",
-        "",
-        f"Scenario ID: {scenario_config.get('id', 'S046_VertiportCapacity')}",
-        f"Test Case: {tc_id}",
-        f"Title: {tc_entry.get('title', 'N/A')}",
-        "",
-        "## Hardware & Layout",
-        f"- TLOF pads: {layout.get('tlof_pads', 1)}",
-        f"- Gates: {layout.get('parking_gates', [])}",
-        f"- Holding pattern capacity: {layout.get('holding_pattern', {}).get('capacity', 'n/a')} "
-        f"(max loiter {layout.get('holding_pattern', {}).get('max_loiter_sec', 'n/a')} s)",
-        "",
-        "## Policy Thresholds",
-        f"- Battery emergency threshold: {policies.get('battery_emergency_pct', 'n/a')}%",
-        f"- Max total delay ratio: {policies.get('max_total_delay_ratio', 'n/a')}× optimal",
-        f"- Max individual delay: {policies.get('max_individual_delay_sec', 'n/a')} s",
-        f"- Fairness Gini limit: {policies.get('fairness_gini_limit', 'n/a')}",
-        f"- Max divert ratio: {policies.get('max_divert_ratio', 'n/a')}",
-        "",
-        "## Constraints Snapshot",
-        f"- Gate status: {constraints}",
-    ]
+    # The hardware layout and policy thresholds are scenario-level and
+    # identical for every test case; render them once and memoize the block
+    # on the config dict.
+    cache = scenario_config.setdefault("_rendered_blocks", {})
+    static_block = cache.get("scenario_sections")
+    if static_block is None:
+        # Bind raw_data and the nested holding-pattern dict once instead of
+        # re-walking the .get() chains inside the f-strings below.
+        raw = scenario_config.get("raw_data") or {}
+        layout = raw.get("vertiport_layout", scenario_config.get("vertiport_layout", {}))
+        policies = raw.get("policies", scenario_config.get("policies", {}))
+        holding = layout.get("holding_pattern") or {}
+        static_block = cache["scenario_sections"] = (
+            f"## Hardware & Layout\n"
+            f"- TLOF pads: {layout.get('tlof_pads', 1)}\n"
+            f"- Gates: {layout.get('parking_gates', [])}\n"
+            f"- Holding pattern capacity: {holding.get('capacity', _NA)} "
+            f"(max loiter {holding.get('max_loiter_sec', _NA)} s)\n"
+            f"\n"
+            f"## Policy Thresholds\n"
+            f"- Battery emergency threshold: {policies.get('battery_emergency_pct', _NA)}%\n"
+            f"- Max total delay ratio: {policies.get('max_total_delay_ratio', _NA)}× optimal\n"
+            f"- Max individual delay: {policies.get('max_individual_delay_sec', _NA)} s\n"
+            f"- Fairness Gini limit: {policies.get('fairness_gini_limit', _NA)}\n"
+            f"- Max divert ratio: {policies.get('max_divert_ratio', _NA)}"
+        )
+
+    # Landing schedules can run long, so assemble into a single growing
+    # StringIO buffer instead of a list of lines + join.
+    buf = io.StringIO()
+    w = buf.write
+    w(_HEADER(scenario_config.get('id', 'S046_VertiportCapacity'),
+              tc_id, tc_entry.get('title', _NA_UPPER)))
+    w("\n")
+    w(static_block)
+    w("\n\n## Constraints Snapshot\n")
+    w(f"- Gate status: {dumps_compact(constraints)}\n")
 
     demand_profile = tc_entry.get("demand_profile", {})
-    lines.extend([
-        f"- Demand profile: {demand_profile}",
-        ""
-    ])
+    w(f"- Demand profile: {dumps_compact(demand_profile)}\n")
 
+    # Conditional sections omit their headers entirely when empty instead of
+    # emitting "(not provided)" scaffolding that dilutes the prompt.
     landing_schedule = candidate_plan.get("landing_schedule", [])
-    lines.append("## Candidate Landing Schedule")
     if landing_schedule:
+        w("\n## Candidate Landing Schedule\n")
         for item in landing_schedule:
-            lines.append(f"- {item}")
-    else:
-        lines.append("- (not provided)")
-
-    lines.extend([
-        "",
-        "## Objective Metrics",
-        f"- Total delay: {metrics.get('total_delay_sec', 'n/a')} s",
-        f"- Max delay: {metrics.get('max_delay_sec', 'n/a')} s",
-        f"- Fairness (Gini): {metrics.get('fairness_gini', 'n/a')}",
-        f"- Throughput: {metrics.get('throughput_pct', 'n/a')}",
-        f"- Divert ratio: {metrics.get('divert_ratio', 'n/a')}",
-    ])
+            w(f"- {item}\n")
+
+    w("\n## Objective Metrics\n")
+    w(f"- Total delay: {metrics.get('total_delay_sec', _NA)} s\n")
+    w(f"- Max delay: {metrics.get('max_delay_sec', _NA)} s\n")
+    w(f"- Fairness (Gini): {metrics.get('fairness_gini', _NA)}\n")
+    w(f"- Throughput: {metrics.get('throughput_pct', _NA)}\n")
+    w(f"- Divert ratio: {metrics.get('divert_ratio', _NA)}\n")
     if 'customer_satisfaction_penalty' in metrics:
-        lines.append(f"- Customer satisfaction penalty: {metrics['customer_satisfaction_penalty']}")
+        w(f"- Customer satisfaction penalty: {metrics['customer_satisfaction_penalty']}\n")
 
     if candidate_plan.get("mitigations"):
-        lines.extend(["", "## Declared Mitigations"])
-        lines.extend([f"- {k}: {v}" for k, v in candidate_plan["mitigations"].items()])
+        w("\n## Declared Mitigations\n")
+        for k, v in candidate_plan["mitigations"].items():
+            w(f"- {k}: {v}\n")
 
     if candidate_plan.get("issues"):
-        lines.extend(["", "## Issues Noted", *[f"- {issue}" for issue in candidate_plan["issues"]]])
+        w("\n## Issues Noted\n")
+        for issue in candidate_plan["issues"]:
+            w(f"- {issue}\n")
     if candidate_plan.get("violations"):
-        lines.extend(["", "## Violations", *[f"- {vio}" for vio in candidate_plan["violations"]]])
+        w("\n## Violations\n")
+        for vio in candidate_plan["violations"]:
+            w(f"- {vio}\n")
 
     if insights:
-        lines.extend(["", "## Solver Insights"])
-        lines.extend([f"- {tip}" for tip in insights])
-
-    lines.extend([
-        "",
-        "## Output Requirements",
-        "1. decision ∈ {APPROVE, CONDITIONAL_APPROVE, REJECT, EXPLAIN_ONLY, UNCERTAIN}.",
-        "2. Provide ≤6 reasoning steps citing gate availability, queue metrics, and fairness/battery impacts.",
-        "3. `violated_policies` should reference battery_emergency, fairness, capacity, or optimality_gap when relevant.",
-        "4. `CONDITIONAL_APPROVE` must list concrete actions (e.g., fairness bulletin, passenger notification, reupload waiver).",
-        "5. TC04 is advisory only → respond with `EXPLAIN_ONLY` while comparing diversion economics.",
-        "6. TC07 may return `UNCERTAIN` if forecast confidence is insufficient; explain the gap.",
-        "7. Return strict JSON with keys: decision, reasoning_steps, tradeoffs, actions, violated_policies."
-    ])
-
-    return "\n".join(str(line) for line in lines if line is not None)
+        w("\n## Solver Insights\n")
+        for tip in insights:
+            w(f"- {tip}\n")
+
+    w("\n")
+    w(_OUTPUT_REQUIREMENTS)
+
+    prompt = buf.getvalue()
+    if cacheable:
+        scenario_config["_prompt_cache"][tc_id] = prompt
+    return prompt
@@ -20,15 +20,28 @@ Note:
 
 import argparse
 import asyncio
+import gzip
 import json
 import math
+import re
 import sys
 import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+try:
+    # Optional C-accelerated parser; stdlib json is the fallback. Worth it
+    # when batch testing loads dozens of scenario files back to back.
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # Import ProjectAirSim high-level API (not airsim)
 try:
     from projectairsim import ProjectAirSimClient, World, Drone
@@ -38,9 +51,14 @@ except ImportError:
     sys.exit(1)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position3D:
-    """Represents a 3D position in NED coordinate system."""
+    """Represents a 3D position in NED coordinate system.
+
+    Slotted and frozen: instances are created per path sample and per
+    monitoring tick, so the compact fixed layout matters, and nothing
+    mutates a position after construction.
+    """
     north: float
     east: float
     down: float
@@ -63,7 +81,7 @@ class Position3D:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class GeofenceConfig:
     """Geofence configuration."""
     id: str
@@ -75,16 +93,23 @@ class GeofenceConfig:
     zone_type: str = "restricted"  # Zone classification (for S004)
     priority: int = 1  # Higher priority zones checked first
     raw_data: Dict[str, Any] = field(default_factory=dict)  # For time restrictions
-    
-    @property
-    def restricted_distance(self) -> float:
-        """Total restricted distance from center."""
-        return self.radius + self.safety_margin
-    
+    # Derived constants precomputed once at construction so the hot checks
+    # compare squared distances instead of paying a sqrt per containment test.
+    restricted_distance: float = field(init=False)
+    restricted_distance_sq: float = field(init=False)
+    # Parsed (active_start, active_end) datetimes for TFR fences, cached so
+    # time filtering never re-parses the ISO strings; None when the fence
+    # has no time restriction or parsing failed.
+    tfr_window: Optional[Tuple[datetime, datetime]] = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        self.restricted_distance = self.radius + self.safety_margin
+        self.restricted_distance_sq = self.restricted_distance ** 2
+
     def check_violation(self, position: Position3D) -> Tuple[bool, float, str]:
         """
         Check if a position violates this geofence.
-        
+
         Returns:
             Tuple of (is_inside_zone, distance_to_center, action_type)
             - is_inside_zone: Whether position is within this zone
@@ -94,13 +119,20 @@ class GeofenceConfig:
         dx = position.north - self.center.north
         dy = position.east - self.center.east
         dz = position.down - self.center.down
-        distance = math.sqrt(dx**2 + dy**2 + dz**2)
-        
+        # C-level hypot: overflow-safe and cheaper than sqrt of summed powers
+        distance = math.hypot(dx, dy, dz)
+
         is_inside = distance < self.restricted_distance
         return is_inside, distance, self.action
 
 
-@dataclass
+# Packed per-fence scan row: (center_n, center_e, center_d,
+# restricted_distance, restricted_distance_sq, action, fence). Built once
+# per config by _pack_geofence_rows and consumed by every checker.
+GeofenceRow = Tuple[float, float, float, float, float, str, GeofenceConfig]
+
+
+@dataclass(slots=True)
 class AltitudeZoneConfig:
     """Altitude zone configuration for S007."""
     id: str
@@ -110,9 +142,16 @@ class AltitudeZoneConfig:
     altitude_limit_agl: float
     priority: int
     zone_type: str
+    # Squared radius for sqrt-free containment tests (unused for infinite
+    # zones, which are identified by a negative radius before any distance
+    # comparison).
+    radius_sq: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.radius_sq = self.radius ** 2
 
 
-@dataclass
+@dataclass(slots=True)
 class StructureConfig:
     """Structure configuration for S008 altitude waiver."""
     id: str
@@ -121,10 +160,18 @@ class StructureConfig:
     height_agl: float  # Structure height above ground
     waiver_radius: float  # Horizontal radius for waiver applicability
     waiver_altitude_above_structure: float  # Additional altitude allowed above structure
-    total_waiver_altitude: float  # Total altitude limit when waiver applies
+    # Derived constants, computed once at construction like the geofence
+    # radii: total altitude limit when the waiver applies, and the squared
+    # waiver radius for sqrt-free proximity tests.
+    total_waiver_altitude: float = field(init=False)
+    waiver_radius_sq: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.total_waiver_altitude = self.height_agl + self.waiver_altitude_above_structure
+        self.waiver_radius_sq = self.waiver_radius ** 2
 
 
-@dataclass
+@dataclass(slots=True)
 class ScenarioConfig:
     """Parsed scenario configuration."""
     scenario_id: str
@@ -135,51 +182,206 @@ class ScenarioConfig:
     altitude_limit: Optional[float] = None  # Maximum altitude AGL in meters (for S006)
     altitude_zones: List[AltitudeZoneConfig] = field(default_factory=list)  # Zone-based altitude limits (for S007)
     structures: List[StructureConfig] = field(default_factory=list)  # Structures for altitude waivers (for S008)
+    # Struct-of-arrays view of the geofences, packed once at construction;
+    # the checkers scan these rows without touching dataclass attributes.
+    # GeofenceConfig stays the user-facing object; this is its hot-path twin.
+    geofence_rows: Tuple[GeofenceRow, ...] = field(init=False)
+    # Union AABB over all fences' restricted spheres (None when fence-free);
+    # lets the checkers reject far-away queries without scanning any fence.
+    geofence_bounds: Optional[Tuple[float, float, float, float, float, float]] = field(init=False)
+    # Altitude checker specialized once for whichever altitude sources this
+    # scenario carries (structure waiver > zones > global limit); None when
+    # the scenario has no altitude rules. See _make_altitude_checker.
+    altitude_checker: Optional[Callable[[Position3D, float],
+                                        Tuple[bool, str, Dict[str, Any]]]] = field(init=False)
 
+    def __post_init__(self) -> None:
+        self.geofence_rows = _pack_geofence_rows(self.geofences)
+        self.geofence_bounds = _geofence_bounds(self.geofence_rows)
+        self.altitude_checker = _make_altitude_checker(
+            self.structures, self.altitude_zones, self.altitude_limit)
 
-@dataclass
+
+@dataclass(slots=True)
 class TrajectoryRecorder:
-    """Records drone trajectory during scenario execution."""
-    points: List[Dict[str, Any]] = field(default_factory=list)
+    """
+    Records drone trajectory during scenario execution.
+
+    Points live in four parallel array('d') columns (timestamp, north,
+    east, down): contiguous C doubles instead of a Python object per
+    sample, so an hour of 10 Hz recording stays cache-dense and append
+    is a plain memory write. Rows are materialized only when saving in
+    the row-oriented schema consumed by detect_violations.py.
+    """
     start_time: float = 0.0
-    
+    _ts: array = field(init=False)
+    _ns: array = field(init=False)
+    _es: array = field(init=False)
+    _ds: array = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._ts = array('d')
+        self._ns = array('d')
+        self._es = array('d')
+        self._ds = array('d')
+
+    def __len__(self) -> int:
+        """Number of recorded points."""
+        return len(self._ts)
+
+    def point(self, i: int) -> Tuple[float, float, float, float]:
+        """Recorded point i as a (timestamp, north, east, down) tuple."""
+        return self._ts[i], self._ns[i], self._es[i], self._ds[i]
+
+    def last_point(self) -> Tuple[float, float, float, float]:
+        """Most recent recorded point; raises IndexError when empty."""
+        return self.point(-1)
+
+    def last_position(self) -> Optional[Position3D]:
+        """Most recent recorded position, or None when nothing is recorded.
+
+        The error-recovery paths use this as the last-known position when
+        the client connection is gone; keeping it here makes the recorder
+        the single source of truth instead of callers unpacking the tail
+        of the storage themselves.
+        """
+        if not self._ts:
+            return None
+        return Position3D(north=self._ns[-1], east=self._es[-1], down=self._ds[-1])
+
     def start(self) -> None:
         """Start recording."""
         self.start_time = time.time()
-        self.points = []
-    
+        self._ts = array('d')
+        self._ns = array('d')
+        self._es = array('d')
+        self._ds = array('d')
+
     def record_point(self, position: Position3D, timestamp: Optional[float] = None) -> None:
         """Record a trajectory point."""
+        self.record_coords(position.north, position.east, position.down, timestamp)
+
+    def record_coords(self, north: float, east: float, down: float,
+                      timestamp: Optional[float] = None) -> None:
+        """Record a trajectory point from bare coordinates.
+
+        Hot-loop entry: the monitors fetch coordinates as plain floats, so
+        appending them directly avoids a Position3D per tick that existed
+        only to be unpacked again here.
+        """
         if timestamp is None:
             timestamp = time.time() - self.start_time
-        
-        self.points.append({
-            'timestamp': timestamp,
-            'position': position.to_dict()
-        })
-    
-    def save(self, output_file: Path, metadata: Optional[Dict[str, Any]] = None) -> None:
-        """Save trajectory to JSON file."""
+
+        self._ts.append(timestamp)
+        self._ns.append(north)
+        self._es.append(east)
+        self._ds.append(down)
+
+    def save(self, output_file: Path, metadata: Optional[Dict[str, Any]] = None,
+             columnar: bool = False) -> None:
+        """
+        Save trajectory to JSON file.
+
+        By default the trajectory is written in the row-oriented schema all
+        runner scripts produce ({'timestamp': ..., 'position': {...}} per
+        point). columnar=True instead emits parallel 't'/'n'/'e'/'d' arrays
+        - several times smaller for long monitored flights since the key
+        strings are not repeated per point. detect_violations.py reads both.
+
+        A '.gz' output suffix (e.g. trajectory.json.gz) switches to a
+        gzip-compressed stream: one zlib pass over the whole serialized
+        document, typically another 5-10x over the textual float dump for
+        long recordings. detect_violations.py reads those transparently.
+        """
+        if columnar and self._ts:
+            trajectory: Any = {'t': list(self._ts), 'n': list(self._ns),
+                               'e': list(self._es), 'd': list(self._ds)}
+        else:
+            trajectory = [
+                {'timestamp': ts, 'position': {'north': n, 'east': e, 'down': d}}
+                for ts, n, e, d in zip(self._ts, self._ns, self._es, self._ds)
+            ]
         data = {
             'metadata': metadata or {},
             'recorded_at': datetime.now().isoformat(),
-            'duration_seconds': self.points[-1]['timestamp'] if self.points else 0.0,
-            'trajectory': self.points
+            'duration_seconds': self._ts[-1] if self._ts else 0.0,
+            'trajectory': trajectory
         }
         
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        
-        print(f"✓ Trajectory saved: {output_file} ({len(self.points)} points)")
+        # Serialize once and hand the writer a single large string:
+        # json.dump() with indent pushes thousands of tiny chunks through
+        # the file object for long trajectories, while one write goes
+        # straight through the buffer (or gzip's, for .gz outputs).
+        serialized = json.dumps(data, indent=2)
+        if output_file.suffix == '.gz':
+            with gzip.open(output_file, 'wt', encoding='utf-8') as f:
+                f.write(serialized)
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(serialized)
+
+        print(f"✓ Trajectory saved: {output_file} ({len(self._ts)} points)")
+
+    def save_async(self, output_file: Path, metadata: Optional[Dict[str, Any]] = None,
+                   columnar: bool = False) -> 'Future[None]':
+        """
+        Save on a background thread so the caller is not blocked on the
+        serialize + write for long trajectories.
+
+        Returns the Future; call .result() before exiting if the file must
+        exist when you continue (the runner's teardown save stays
+        synchronous for exactly that reason). The columns are snapshotted
+        before submission, so recording may continue while the save runs.
+        """
+        snapshot = TrajectoryRecorder(start_time=self.start_time)
+        snapshot._ts = array('d', self._ts)
+        snapshot._ns = array('d', self._ns)
+        snapshot._es = array('d', self._es)
+        snapshot._ds = array('d', self._ds)
+        return _save_executor().submit(snapshot.save, output_file, metadata, columnar)
+
+
+# Single shared writer thread for background trajectory saves, created on
+# first use so scripts that only ever save synchronously spawn no thread.
+_SAVE_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def _save_executor() -> ThreadPoolExecutor:
+    global _SAVE_EXECUTOR
+    if _SAVE_EXECUTOR is None:
+        _SAVE_EXECUTOR = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix='traj-save')
+    return _SAVE_EXECUTOR
+
+
+# Test-command parser for auto mode, compiled once at import instead of a
+# fresh uncompiled re.search per executed command.
+_MOVE_TO_POSITION_RE = re.compile(
+    r'move_to_position\s*\(\s*([-\d.]+)\s*,\s*([-\d.]+)\s*,\s*([-\d.]+)\s*\)'
+)
+
+
+# Matches a JSON string literal OR a line/block comment in one alternation,
+# compiled once at import. Matching string literals first means comment
+# markers inside strings (e.g. "http://...") are never stripped, which the
+# old two-pass re.sub approach got wrong.
+_JSON_COMMENT_RE = re.compile(
+    r'"(?:\\.|[^"\\])*"'   # string literal (kept verbatim)
+    r'|//[^\n]*'           # line comment
+    r'|/\*.*?\*/',         # block comment
+    re.DOTALL
+)
+
+
+def _keep_strings_drop_comments(match: 're.Match[str]') -> str:
+    token = match.group(0)
+    return token if token.startswith('"') else ''
 
 
 def strip_json_comments(text: str) -> str:
-    """Remove JavaScript-style comments from JSON."""
-    import re
-    text = re.sub(r'//.*?$', '', text, flags=re.MULTILINE)
-    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
-    return text
+    """Remove JavaScript-style comments from JSON in a single pass."""
+    return _JSON_COMMENT_RE.sub(_keep_strings_drop_comments, text)
 
 
 def parse_iso8601(time_str: str) -> datetime:
@@ -246,30 +448,28 @@ def identify_altitude_zone(
     
     Strategy:
         Check zones from highest to lowest priority to handle nested zones
-        (e.g., urban core inside urban edge inside suburban)
+        (e.g., urban core inside urban edge inside suburban). The zone list
+        is already priority-sorted (descending) by load_scenario_config.
     """
     if not altitude_zones:
         return None
-    
-    # Sort zones by priority (descending)
-    sorted_zones = sorted(altitude_zones, key=lambda z: z.priority, reverse=True)
-    
-    for zone in sorted_zones:
+
+    for zone in altitude_zones:
         # Check if position is in this zone
         if zone.radius < 0:
             # Infinite zone (default/suburban)
             return zone
         
-        # Calculate horizontal distance (north and east only, no altitude)
+        # Calculate horizontal distance (north and east only, no altitude);
+        # compare squared to avoid a sqrt per zone
         dx = position.north - zone.center.north
         dy = position.east - zone.center.east
-        distance = math.sqrt(dx**2 + dy**2)
-        
-        if distance < zone.radius:
+
+        if dx**2 + dy**2 < zone.radius_sq:
             return zone
     
     # Default to lowest priority zone
-    return sorted_zones[-1] if sorted_zones else None
+    return altitude_zones[-1]
 
 
 def check_zone_altitude_limit(
@@ -296,15 +496,14 @@ def check_zone_altitude_limit(
         (True, "目标位置在城市核心区（限制60.0m），高度50.0m合规（距限制10.0m）", urban_core_zone)
     """
     zone = identify_altitude_zone(position, altitude_zones)
-    
+
     if not zone:
         return (True, "未识别到高度限制区域", None)
-    
-    # Calculate horizontal distance for logging
-    dx = position.north - zone.center.north
-    dy = position.east - zone.center.east
-    distance = math.sqrt(dx**2 + dy**2)
-    
+
+    # No distance recomputation here: identify_altitude_zone already did the
+    # containment math, and neither message below uses the distance. Callers
+    # that want it for logging derive it from the returned zone.
+
     # Check altitude against zone's limit
     if target_altitude_agl >= zone.altitude_limit_agl:
         excess = target_altitude_agl - zone.altitude_limit_agl
@@ -380,24 +579,37 @@ def check_structure_waiver(
                 None
             )
     
-    # Find nearest structure within waiver radius
+    # Single pass over the structures: track both the nearest structure
+    # whose waiver radius covers the position (which decides the outcome)
+    # and the overall nearest structure (only needed for the no-waiver
+    # report), instead of re-scanning the whole list a second time just to
+    # build that message.
     applicable_structure = None
-    min_distance = float('inf')
-    
+    min_distance_sq = float('inf')
+    nearest_dist_sq = float('inf')
+    nearest_structure_id = None
+
     for structure in structures:
-        # Calculate horizontal distance (2D, ignore vertical)
+        # Calculate horizontal distance (2D, ignore vertical); squared
+        # comparison keeps sqrt out of the scan
         dx = position.north - structure.location.north
         dy = position.east - structure.location.east
-        horizontal_distance = math.sqrt(dx**2 + dy**2)
-        
+        horizontal_dist_sq = dx**2 + dy**2
+
+        if horizontal_dist_sq < nearest_dist_sq:
+            nearest_dist_sq = horizontal_dist_sq
+            nearest_structure_id = structure.id
+
         # Check if within waiver radius
-        if horizontal_distance < structure.waiver_radius:
-            if horizontal_distance < min_distance:
-                min_distance = horizontal_distance
+        if horizontal_dist_sq < structure.waiver_radius_sq:
+            if horizontal_dist_sq < min_distance_sq:
+                min_distance_sq = horizontal_dist_sq
                 applicable_structure = structure
     
     if applicable_structure:
         # Waiver applies: use structure's waiver altitude limit
+        # (sqrt deferred until the reporting string actually needs it)
+        min_distance = math.sqrt(min_distance_sq)
         waiver_limit = applicable_structure.total_waiver_altitude
         
         if target_altitude_agl >= waiver_limit:
@@ -419,19 +631,10 @@ def check_structure_waiver(
                 applicable_structure
             )
     else:
-        # No waiver applies: use global limit
-        # Calculate distance to nearest structure for reporting
-        nearest_distance = float('inf')
-        nearest_structure_id = None
-        
-        for structure in structures:
-            dx = position.north - structure.location.north
-            dy = position.east - structure.location.east
-            distance = math.sqrt(dx**2 + dy**2)
-            if distance < nearest_distance:
-                nearest_distance = distance
-                nearest_structure_id = structure.id
-        
+        # No waiver applies: use global limit; nearest structure was
+        # tracked during the scan above, sqrt only for the report
+        nearest_distance = math.sqrt(nearest_dist_sq)
+
         if target_altitude_agl >= global_altitude_limit:
             excess = target_altitude_agl - global_altitude_limit
             return (
@@ -451,6 +654,115 @@ def check_structure_waiver(
             )
 
 
+def _make_altitude_checker(
+    structures: List[StructureConfig],
+    altitude_zones: List[AltitudeZoneConfig],
+    altitude_limit: Optional[float]
+) -> Optional[Callable[[Position3D, float], Tuple[bool, str, Dict[str, Any]]]]:
+    """
+    Specialize the pre-flight altitude check for one scenario's config.
+
+    The old call site re-inspected scenario_config fields and re-derived the
+    applicable global limit on every command; the branch is the same for the
+    scenario's whole lifetime, so it is resolved here once. Each closure
+    returns (is_safe, reason, ctx) where ctx carries the branch-specific
+    header, pre-verdict log lines, rejection wording and extra result keys,
+    leaving the caller a single uniform block. Returns None when the
+    scenario defines no altitude rules at all.
+    """
+    if structures:
+        # S008: Structure altitude waiver
+        # Note: Structure waiver has highest priority as it can override global limits
+        def _structure_checker(target_pos: Position3D,
+                               target_alt: float) -> Tuple[bool, str, Dict[str, Any]]:
+            log = []
+            # Determine global limit to use (zone-based or default 120m)
+            global_limit = 120.0  # Default
+            if altitude_zones:
+                zone = identify_altitude_zone(target_pos, altitude_zones)
+                if zone:
+                    global_limit = zone.altitude_limit_agl
+                    log.append(f"   位置所在区域: {zone.name} (全局限制{global_limit:.1f}m)")
+            elif altitude_limit is not None:
+                global_limit = altitude_limit
+
+            is_safe, reason, structure = check_structure_waiver(
+                position=target_pos,
+                target_altitude_agl=target_alt,
+                structures=structures,
+                global_altitude_limit=global_limit
+            )
+
+            # Log structure identification if applicable
+            if structure:
+                distance = math.hypot(target_pos.north - structure.location.north,
+                                      target_pos.east - structure.location.east)
+                log.append(f"   距{structure.id}: {distance:.1f}m (豁免半径{structure.waiver_radius:.2f}m)")
+                log.append(f"   豁免适用: {structure.name} (高{structure.height_agl:.1f}m)")
+                log.append(f"   豁免上限: {structure.total_waiver_altitude:.2f}m (建筑{structure.height_agl:.1f}m + {structure.waiver_altitude_above_structure:.2f}m)")
+
+            return is_safe, reason, {
+                'header': "\n🔍 Pre-flight check: Altitude limit (structure waiver check)...",
+                'log': log,
+                'banner': 'altitude limit exceeded',
+                'reason': 'Altitude limit exceeded (structure waiver check failed)',
+                'result_extra': {'structure_id': structure.id if structure else None},
+            }
+
+        return _structure_checker
+
+    if altitude_zones:
+        # S007: Zone-based altitude limits
+        def _zone_checker(target_pos: Position3D,
+                          target_alt: float) -> Tuple[bool, str, Dict[str, Any]]:
+            is_safe, reason, zone = check_zone_altitude_limit(
+                position=target_pos,
+                target_altitude_agl=target_alt,
+                altitude_zones=altitude_zones
+            )
+
+            # Log zone identification
+            log = []
+            if zone:
+                distance = math.hypot(target_pos.north - zone.center.north,
+                                      target_pos.east - zone.center.east)
+                if zone.radius > 0:
+                    log.append(f"   识别区域: {zone.name} (距中心{distance:.1f}m < {zone.radius:.1f}m)")
+                else:
+                    log.append(f"   识别区域: {zone.name} (距中心{distance:.1f}m)")
+
+            return is_safe, reason, {
+                'header': "\n🔍 Pre-flight check: Altitude limit (zone-based)...",
+                'log': log,
+                'banner': 'zone altitude limit exceeded',
+                'reason': 'Zone altitude limit exceeded',
+                'result_extra': {'zone_id': zone.id if zone else None},
+            }
+
+        return _zone_checker
+
+    if altitude_limit is not None:
+        # S006: Global altitude limit
+        def _global_checker(target_pos: Position3D,
+                            target_alt: float) -> Tuple[bool, str, Dict[str, Any]]:
+            is_safe, reason = check_altitude_limit(
+                target_altitude_agl=target_alt,
+                limit=altitude_limit,
+                tolerance=0.0  # Strict enforcement
+            )
+            return is_safe, reason, {
+                'header': "\n🔍 Pre-flight check: Altitude limit...",
+                'log': [],
+                'banner': 'altitude limit exceeded',
+                'reason': 'Altitude limit exceeded',
+                'result_extra': {},
+            }
+
+        return _global_checker
+
+    return None
+
+
 def filter_active_geofences(
     geofences: List[GeofenceConfig], 
     simulated_time: Optional[str] = None
@@ -488,10 +800,16 @@ def filter_active_geofences(
             active.append(gf)
             continue
         
-        # Parse TFR activation times
+        # Parse TFR activation times (usually pre-parsed at load and cached
+        # on the fence; fall back to parsing here so hand-built fences and
+        # previously failed parses keep their warning behavior)
         try:
-            start_time = parse_iso8601(time_restriction['active_start'])
-            end_time = parse_iso8601(time_restriction['active_end'])
+            if gf.tfr_window is not None:
+                start_time, end_time = gf.tfr_window
+            else:
+                start_time = parse_iso8601(time_restriction['active_start'])
+                end_time = parse_iso8601(time_restriction['active_end'])
+                gf.tfr_window = (start_time, end_time)
             tfr_type = time_restriction.get('type', 'unknown')
             
             # Check if current time is within active period
@@ -541,7 +859,7 @@ def load_scenario_config(scenario_file: Path, simulated_time: Optional[str] = No
         content = f.read()
     
     clean_content = strip_json_comments(content)
-    data = json.loads(clean_content)
+    data = _loads(clean_content)
     
     # Parse geofences
     geofences = []
@@ -577,11 +895,30 @@ def load_scenario_config(scenario_file: Path, simulated_time: Optional[str] = No
             
             # Attach raw data for time restriction access
             gf_config.raw_data = gf_data
+
+            # Eagerly parse TFR activation times so time filtering works on
+            # cached datetime objects; a malformed window is left as None and
+            # surfaces through filter_active_geofences' warning path instead.
+            time_restriction = gf_data.get('time_restriction')
+            if time_restriction:
+                try:
+                    gf_config.tfr_window = (
+                        parse_iso8601(time_restriction['active_start']),
+                        parse_iso8601(time_restriction['active_end'])
+                    )
+                except Exception:
+                    pass
+
             geofences.append(gf_config)
     
     # Filter geofences by time if simulated_time is provided
     if simulated_time:
         geofences = filter_active_geofences(geofences, simulated_time)
+
+    # Sort once here (lower number = higher priority) so the per-query
+    # checkers can walk the list in priority order without re-sorting on
+    # every position sample.
+    geofences.sort(key=attrgetter('priority'))
     
     # Load altitude limit if specified (for S006)
     altitude_limit = None
@@ -624,6 +961,10 @@ def load_scenario_config(scenario_file: Path, simulated_time: Optional[str] = No
                 zone_type=zone_data.get('zone_type', 'unknown')
             )
             altitude_zones.append(zone_config)
+
+        # Highest priority first, once at load; identify_altitude_zone
+        # depends on this order to resolve nested zones.
+        altitude_zones.sort(key=attrgetter('priority'), reverse=True)
     
     # Load structures if specified (for S008)
     structures = []
@@ -637,20 +978,13 @@ def load_scenario_config(scenario_file: Path, simulated_time: Optional[str] = No
                 down=0.0  # Structure base at ground level
             )
             
-            # Parse structure parameters
-            height_agl = struct_data['height_agl']
-            waiver_radius = struct_data['waiver_radius']
-            waiver_altitude_above_structure = struct_data['waiver_altitude_above_structure']
-            total_waiver_altitude = height_agl + waiver_altitude_above_structure
-            
             structure_config = StructureConfig(
                 id=struct_data['id'],
                 name=struct_data['name'],
                 location=location,
-                height_agl=height_agl,
-                waiver_radius=waiver_radius,
-                waiver_altitude_above_structure=waiver_altitude_above_structure,
-                total_waiver_altitude=total_waiver_altitude
+                height_agl=struct_data['height_agl'],
+                waiver_radius=struct_data['waiver_radius'],
+                waiver_altitude_above_structure=struct_data['waiver_altitude_above_structure']
             )
             structures.append(structure_config)
     
@@ -676,26 +1010,132 @@ def get_drone_position(drone: Drone) -> Position3D:
     Returns:
         Position3D in NED coordinates
     """
+    north, east, down = get_drone_position_coords(drone)
+    return Position3D(north=north, east=east, down=down)
+
+
+def get_drone_position_coords(drone: Drone) -> Tuple[float, float, float]:
+    """
+    Get current drone position as a bare (north, east, down) tuple.
+
+    The monitoring loops run at 2-10 Hz and only need three floats for
+    recording and the fence scan; skipping the Position3D wrapper removes
+    one allocation plus three attribute reads per tick.
+
+    Args:
+        drone: Drone instance
+
+    Returns:
+        (north, east, down) in NED coordinates
+    """
     # Get pose from drone (synchronous method, returns dict)
     pose = drone.get_ground_truth_pose()
-    
+
     # Extract position (NED coordinates) from dict
     translation = pose['translation']
-    
-    return Position3D(
-        north=translation['x'],
-        east=translation['y'],
-        down=translation['z']
+
+    return translation['x'], translation['y'], translation['z']
+
+
+def _geofence_violation_msg(geofence: GeofenceConfig, distance: float) -> str:
+    """Format a hard-violation message; called on hits only."""
+    return (
+        f"Geofence '{geofence.id}' ({geofence.zone_type} zone) violated: "
+        f"distance={distance:.1f}m (required >{geofence.restricted_distance:.1f}m), "
+        f"depth={geofence.restricted_distance - distance:.1f}m"
+    )
+
+
+def _geofence_warning_msg(geofence: GeofenceConfig, distance: float) -> str:
+    """Format a warning-zone message; called on hits only."""
+    return (
+        f"WARNING: Entering '{geofence.id}' ({geofence.zone_type} zone): "
+        f"distance={distance:.1f}m, notification to authorities required"
+    )
+
+
+def _geofence_bounds(
+    rows: Tuple[GeofenceRow, ...]
+) -> Optional[Tuple[float, float, float, float, float, float]]:
+    """
+    Axis-aligned bounding box covering every fence's restricted sphere.
+
+    (min_n, max_n, min_e, max_e, min_d, max_d), or None when there are no
+    fences. This is the root node of the R-tree one would build for a large
+    fence set: a query point outside it cannot hit anything, so the checkers
+    skip the scan entirely - the common case for a drone operating well away
+    from all restricted zones.
+    """
+    if not rows:
+        return None
+    min_n = min_e = min_d = math.inf
+    max_n = max_e = max_d = -math.inf
+    for cn, ce, cd, r, _restricted_sq, _action, _geofence in rows:
+        if cn - r < min_n: min_n = cn - r
+        if cn + r > max_n: max_n = cn + r
+        if ce - r < min_e: min_e = ce - r
+        if ce + r > max_e: max_e = ce + r
+        if cd - r < min_d: min_d = cd - r
+        if cd + r > max_d: max_d = cd + r
+    return (min_n, max_n, min_e, max_e, min_d, max_d)
+
+
+def _pack_geofence_rows(geofences: List[GeofenceConfig]) -> Tuple[GeofenceRow, ...]:
+    """Pack fences into flat scan rows; see ScenarioConfig.geofence_rows."""
+    return tuple(
+        (g.center.north, g.center.east, g.center.down,
+         g.restricted_distance, g.restricted_distance_sq, g.action, g)
+        for g in geofences
     )
 
 
-def check_geofences(position: Position3D, geofences: List[GeofenceConfig]) -> Tuple[str, List[str], List[str]]:
+def _scan_geofence_rows(
+    pos_n: float, pos_e: float, pos_d: float,
+    rows: Tuple[GeofenceRow, ...]
+) -> List[Tuple[float, str, GeofenceConfig]]:
+    """
+    Numeric scan kernel: test one query point against all packed fence rows.
+
+    Takes bare floats and returns (dist_sq, action, fence) tuples for the
+    fences whose restricted sphere contains the point, in priority order.
+    Deliberately free of Position3D access, string work and decision logic
+    so the whole function is a straight-line arithmetic loop (and the one
+    spot a JIT decorator would go, were one available here).
+    """
+    hits = []
+    for cn, ce, cd, r, restricted_sq, action, geofence in rows:
+        # Per-axis box rejection first: in the dominant far-away case one or
+        # two compares retire the fence before any multiply happens.
+        dx = pos_n - cn
+        if dx > r or dx < -r:
+            continue
+        dy = pos_e - ce
+        if dy > r or dy < -r:
+            continue
+        dz = pos_d - cd
+        dist_sq = dx**2 + dy**2 + dz**2
+        if dist_sq < restricted_sq:
+            hits.append((dist_sq, action, geofence))
+    return hits
+
+
+def check_geofences(
+    position: Position3D,
+    geofences: List[GeofenceConfig],
+    rows: Optional[Tuple[GeofenceRow, ...]] = None,
+    bounds: Optional[Tuple[float, float, float, float, float, float]] = None
+) -> Tuple[str, List[str], List[str]]:
     """
     Check if position violates any geofences or triggers warnings.
     
     Args:
         position: Current position
         geofences: List of geofence configurations
+        rows: Optional pre-packed scan rows (ScenarioConfig.geofence_rows);
+            packed on the fly for ad-hoc fence lists
+        bounds: Optional union AABB over all fences
+            (ScenarioConfig.geofence_bounds); queries outside it skip the
+            scan entirely
     
     Returns:
         Tuple of (decision, violations, warnings)
@@ -703,31 +1143,52 @@ def check_geofences(position: Position3D, geofences: List[GeofenceConfig]) -> Tu
         - violations: List of rejection messages
         - warnings: List of warning messages
     """
+    return check_geofences_at(position.north, position.east, position.down,
+                              geofences, rows, bounds)
+
+
+def check_geofences_at(
+    pos_n: float, pos_e: float, pos_d: float,
+    geofences: List[GeofenceConfig],
+    rows: Optional[Tuple[GeofenceRow, ...]] = None,
+    bounds: Optional[Tuple[float, float, float, float, float, float]] = None
+) -> Tuple[str, List[str], List[str]]:
+    """
+    check_geofences on bare coordinates; the monitoring loops call this
+    directly with the floats from get_drone_position_coords so no
+    Position3D is built per tick.
+    """
+    if bounds is not None:
+        min_n, max_n, min_e, max_e, min_d, max_d = bounds
+        if (pos_n < min_n or pos_n > max_n or
+                pos_e < min_e or pos_e > max_e or
+                pos_d < min_d or pos_d > max_d):
+            return "APPROVE", [], []
+
+    # Geofences arrive priority-sorted from load_scenario_config (lower
+    # number = higher priority), so no per-query sort is needed.
+    if rows is None:
+        rows = _pack_geofence_rows(geofences)
+
+    hits = _scan_geofence_rows(pos_n, pos_e, pos_d, rows)
+    if not hits:
+        # Hot path: the monitoring tick far from every fence pays for the
+        # numeric scan only - no message lists, no formatting.
+        return "APPROVE", [], []
+
     violations = []
     warnings = []
-    
-    # Sort geofences by priority (lower number = higher priority)
-    sorted_geofences = sorted(geofences, key=lambda g: g.priority)
-    
-    for geofence in sorted_geofences:
-        is_inside, distance, action = geofence.check_violation(position)
-        
-        if is_inside:
-            if action == "reject":
-                # Hard violation - command should be rejected
-                depth = geofence.restricted_distance - distance
-                violations.append(
-                    f"Geofence '{geofence.id}' ({geofence.zone_type} zone) violated: "
-                    f"distance={distance:.1f}m (required >{geofence.restricted_distance:.1f}m), "
-                    f"depth={depth:.1f}m"
-                )
-            elif action == "warn":
-                # Soft violation - command approved with warning
-                warnings.append(
-                    f"WARNING: Entering '{geofence.id}' ({geofence.zone_type} zone): "
-                    f"distance={distance:.1f}m, notification to authorities required"
-                )
-    
+    for dist_sq, action, geofence in hits:
+        # sqrt and message formatting only on hits; the far-away common
+        # case never pays for float->str work
+        distance = math.sqrt(dist_sq)
+        if action == "reject":
+            # Hard violation - command should be rejected
+            violations.append(_geofence_violation_msg(geofence, distance))
+        elif action == "warn":
+            # Soft violation - command approved with warning
+            warnings.append(_geofence_warning_msg(geofence, distance))
+
     # Determine final decision
     if len(violations) > 0:
         return "REJECT", violations, warnings
@@ -737,6 +1198,58 @@ def check_geofences(position: Position3D, geofences: List[GeofenceConfig]) -> Tu
         return "APPROVE", violations, warnings
 
 
+def _sample_path_coords(start: Position3D, end: Position3D,
+                        interval: float = 10.0) -> List[Tuple[float, float, float]]:
+    """
+    Sample a linear path as plain (north, east, down) tuples.
+
+    Coordinate-only backend for sample_path; the path sweep consumes these
+    tuples directly so no Position3D objects are built for samples that are
+    only ever distance-tested.
+    """
+    # Calculate total distance
+    dx = end.north - start.north
+    dy = end.east - start.east
+    dz = end.down - start.down
+    total_distance = math.hypot(dx, dy, dz)
+
+    if total_distance == 0:
+        return [(start.north, start.east, start.down)]
+
+    # Calculate number of samples
+    num_samples = max(2, int(total_distance / interval) + 1)
+
+    # Emit the whole sample list in one comprehension with the endpoints and
+    # deltas bound to locals: one resize-free list allocation and no
+    # attribute lookups inside the loop (the scalar analogue of building the
+    # three axes with a vectorized linspace).
+    start_n = start.north
+    start_e = start.east
+    start_d = start.down
+    last = num_samples - 1
+    return [
+        (start_n + (t := i / last) * dx,
+         start_e + t * dy,
+         start_d + t * dz)
+        for i in range(num_samples)
+    ]
+
+
+def _path_sample_count(start: Position3D, end: Position3D, interval: float = 10.0) -> int:
+    """
+    Number of samples sample_path would generate, without generating them.
+
+    Closed-form from the path length, so callers that only report the count
+    (the pre-flight prints) do not rebuild the whole sample list.
+    """
+    total_distance = math.hypot(end.north - start.north,
+                                end.east - start.east,
+                                end.down - start.down)
+    if total_distance == 0:
+        return 1
+    return max(2, int(total_distance / interval) + 1)
+
+
 def sample_path(start: Position3D, end: Position3D, interval: float = 10.0) -> List[Position3D]:
     """
     Sample points along a linear path between start and end positions.
@@ -749,99 +1262,186 @@ def sample_path(start: Position3D, end: Position3D, interval: float = 10.0) -> L
     Returns:
         List of sampled positions along the path
     """
-    # Calculate total distance
-    dx = end.north - start.north
-    dy = end.east - start.east
-    dz = end.down - start.down
-    total_distance = math.sqrt(dx**2 + dy**2 + dz**2)
-    
-    if total_distance == 0:
+    if start.north == end.north and start.east == end.east and start.down == end.down:
         return [start]
-    
-    # Calculate number of samples
-    num_samples = max(2, int(total_distance / interval) + 1)
-    
-    samples = []
-    for i in range(num_samples):
-        t = i / (num_samples - 1)  # Parameter from 0 to 1
-        sample = Position3D(
-            north=start.north + t * dx,
-            east=start.east + t * dy,
-            down=start.down + t * dz
-        )
-        samples.append(sample)
-    
-    return samples
+    return [Position3D(north=n, east=e, down=d)
+            for n, e, d in _sample_path_coords(start, end, interval)]
 
 
 def check_path_geofences(
     start: Position3D,
     end: Position3D,
     geofences: List[GeofenceConfig],
-    sample_interval: float = 10.0
-) -> Tuple[str, List[str], List[str], Optional[Position3D]]:
+    sample_interval: float = 10.0,
+    rows: Optional[Tuple[GeofenceRow, ...]] = None,
+    bounds: Optional[Tuple[float, float, float, float, float, float]] = None
+) -> Tuple[str, List[str], List[str], Optional[Position3D], int]:
     """
     Check if a flight path crosses through any geofences or warning zones.
-    
-    This function samples points along the linear path from start to end
-    and checks each sample point for geofence violations and warnings.
-    
+
+    Reject fences are tested with an exact segment-to-sphere closest-approach
+    formula, so no sampling step can alias past a thin zone; warning zones
+    are checked at the path endpoints.
+
     Args:
         start: Starting position
         end: Ending position
         geofences: List of geofence configurations
-        sample_interval: Distance between sample points (meters)
-    
+        sample_interval: Nominal sampling resolution (meters); only used to
+            derive n_samples for reporting, the reject test itself is exact
+
     Returns:
-        Tuple of (decision, violations, warnings, violation_position)
+        Tuple of (decision, violations, warnings, violation_position, n_samples)
         - decision: "REJECT", "APPROVE_WITH_WARNING", or "APPROVE"
-        - violations: List of rejection messages
+        - violations: List of rejection messages (first violation only;
+          the highest-priority crossed fence decides)
         - warnings: List of warning messages
-        - violation_position: Position of first violation (if any)
+        - violation_position: Closest approach to the first crossed fence
+        - n_samples: Nominal sample count for the path, so callers reporting
+          the count do not re-sample it
     """
-    # Sample path
-    path_samples = sample_path(start, end, sample_interval)
-    
-    violations = []
+    if bounds is not None:
+        # A segment whose AABB misses the union fence AABB cannot come
+        # within any restricted radius - skip the per-fence tests entirely.
+        min_n, max_n, min_e, max_e, min_d, max_d = bounds
+        if (max(start.north, end.north) < min_n or min(start.north, end.north) > max_n or
+                max(start.east, end.east) < min_e or min(start.east, end.east) > max_e or
+                max(start.down, end.down) < min_d or min(start.down, end.down) > max_d):
+            return "APPROVE", [], [], None, _path_sample_count(start, end, sample_interval)
+
+    if rows is None:
+        rows = _pack_geofence_rows(geofences)
+    if not rows:
+        # No fences at all; nothing can reject or warn.
+        return "APPROVE", [], [], None, _path_sample_count(start, end, sample_interval)
+
+    # Geofences arrive priority-sorted from load_scenario_config. Split the
+    # test by action: reject fences get the exact segment test below, while
+    # warning zones only ever report at the path endpoints, so they are
+    # handled separately at the end.
+    reject_rows = [row for row in rows if row[5] == "reject"]
+    warn_rows = [row for row in rows if row[5] == "warn"]
+
+    # The old fixed-step sweep could both miss thin zones (a fence whose
+    # restricted radius is under half the sample interval) and waste work on
+    # long clear paths. The segment-to-sphere test is exact and O(1) per
+    # fence: project the fence center onto the segment, clamp t to [0, 1],
+    # and compare the squared distance at the closest approach against the
+    # squared restricted radius. n_samples is still reported at the nominal
+    # sampling resolution so the counts callers print (and the warn-message
+    # sample indices) keep their meaning.
+    n_samples = _path_sample_count(start, end, sample_interval)
+    v_n = end.north - start.north
+    v_e = end.east - start.east
+    v_d = end.down - start.down
+    vv = v_n * v_n + v_e * v_e + v_d * v_d
+
+    for cn, ce, cd, r, restricted_sq, action, geofence in reject_rows:
+        w_n = cn - start.north
+        w_e = ce - start.east
+        w_d = cd - start.down
+        if vv > 0.0:
+            t = (w_n * v_n + w_e * v_e + w_d * v_d) / vv
+            if t < 0.0:
+                t = 0.0
+            elif t > 1.0:
+                t = 1.0
+        else:
+            # Degenerate zero-length path: the closest approach is the point
+            t = 0.0
+        dx = w_n - t * v_n
+        dy = w_e - t * v_e
+        dz = w_d - t * v_d
+        dist_sq = dx**2 + dy**2 + dz**2
+
+        if dist_sq < restricted_sq:
+            # Highest-priority crossed fence decides the outcome, matching
+            # the priority-ordered scan in check_geofences. (Rejected
+            # commands never surface the warning list, so nothing is lost
+            # by returning early.)
+            distance = math.sqrt(dist_sq)
+            restricted = r
+            depth = restricted - distance
+            closest_pos = Position3D(north=start.north + t * v_n,
+                                     east=start.east + t * v_e,
+                                     down=start.down + t * v_d)
+            violation = (
+                f"Path crosses geofence '{geofence.id}' ({geofence.zone_type}) at closest approach: "
+                f"position=(N={closest_pos.north:.1f}, E={closest_pos.east:.1f}, Alt={closest_pos.altitude:.1f}m), "
+                f"distance={distance:.1f}m (required >{restricted:.1f}m), "
+                f"violation_depth={depth:.1f}m"
+            )
+            return "REJECT", [violation], [], closest_pos, n_samples
+
+    # Path clears every reject fence; note warning zones at the endpoints
+    # only (interior warn hits were never reported)
     warnings = []
-    violation_position = None
-    
-    # Sort geofences by priority
-    sorted_geofences = sorted(geofences, key=lambda g: g.priority)
-    
-    # Check each sample point
-    for i, sample_pos in enumerate(path_samples):
-        for geofence in sorted_geofences:
-            is_inside, distance, action = geofence.check_violation(sample_pos)
-            
-            if is_inside:
-                if action == "reject":
-                    depth = geofence.restricted_distance - distance
-                    
-                    if violation_position is None:
-                        violation_position = sample_pos
-                    
-                    violations.append(
-                        f"Path crosses geofence '{geofence.id}' ({geofence.zone_type}) at sample {i}/{len(path_samples)}: "
-                        f"position=(N={sample_pos.north:.1f}, E={sample_pos.east:.1f}, Alt={sample_pos.altitude:.1f}m), "
-                        f"distance={distance:.1f}m (required >{geofence.restricted_distance:.1f}m), "
-                        f"violation_depth={depth:.1f}m"
-                    )
-                    break  # One violation message per sample point
-                elif action == "warn":
-                    # Path enters warning zone - note it but don't reject
-                    if i == 0 or i == len(path_samples) - 1:  # Only report at entry/exit
-                        warnings.append(
-                            f"Path enters '{geofence.id}' ({geofence.zone_type}) zone at sample {i}/{len(path_samples)}"
-                        )
-    
+    start_coords = (start.north, start.east, start.down)
+    end_coords = (end.north, end.east, end.down)
+    endpoint_samples = ((0, start_coords),) if n_samples == 1 else (
+        (0, start_coords), (n_samples - 1, end_coords))
+    for i, (pos_n, pos_e, pos_d) in endpoint_samples:
+        for cn, ce, cd, r, restricted_sq, action, geofence in warn_rows:
+            dx = pos_n - cn
+            dy = pos_e - ce
+            dz = pos_d - cd
+            if dx**2 + dy**2 + dz**2 < restricted_sq:
+                warnings.append(
+                    f"Path enters '{geofence.id}' ({geofence.zone_type}) zone at sample {i}/{n_samples}"
+                )
+
     # Determine final decision
-    if len(violations) > 0:
-        return "REJECT", violations, warnings, violation_position
-    elif len(warnings) > 0:
-        return "APPROVE_WITH_WARNING", violations, warnings, violation_position
+    if len(warnings) > 0:
+        return "APPROVE_WITH_WARNING", [], warnings, None, n_samples
     else:
-        return "APPROVE", violations, warnings, violation_position
+        return "APPROVE", [], warnings, None, n_samples
+
+
+def check_trajectory_geofences(
+    points: List[Tuple[float, float, float, float]],
+    geofences: List[GeofenceConfig],
+    rows: Optional[Tuple[GeofenceRow, ...]] = None
+) -> List[bool]:
+    """
+    Batch-check a recorded trajectory against all reject geofences.
+
+    Post-flight analysis wants a per-point verdict for the whole flight in
+    one call rather than a check_geofences() round-trip (and two message
+    lists) per sample. This walks the recorded (timestamp, north, east,
+    down) tuples straight out of TrajectoryRecorder against the packed
+    scan rows, short-circuiting each point on its first rejecting fence
+    and formatting nothing.
+
+    Args:
+        points: Trajectory as (timestamp, north, east, down) tuples
+        geofences: List of geofence configurations
+        rows: Optional pre-packed scan rows (ScenarioConfig.geofence_rows)
+
+    Returns:
+        List of booleans, one per point: True where the point is inside
+        a reject fence's restricted distance
+    """
+    if rows is None:
+        rows = _pack_geofence_rows(geofences)
+    reject_rows = [row[:5] for row in rows if row[5] == "reject"]
+
+    mask = []
+    append = mask.append
+    for _, pos_n, pos_e, pos_d in points:
+        hit = False
+        for cn, ce, cd, r, restricted_sq in reject_rows:
+            dx = pos_n - cn
+            if dx > r or dx < -r:
+                continue
+            dy = pos_e - ce
+            if dy > r or dy < -r:
+                continue
+            dz = pos_d - cd
+            if dx**2 + dy**2 + dz**2 < restricted_sq:
+                hit = True
+                break
+        append(hit)
+    return mask
 
 
 async def run_scenario_manual(
@@ -886,15 +1486,16 @@ async def run_scenario_manual(
     
     print(f"✓ Connected to drone: {drone_name}")
     
-    # Arm and enable API control (synchronous methods)
+    # Arm and enable API control (synchronous RPCs; run them off the event
+    # loop so Ctrl+C and other tasks stay responsive during the round-trips)
     print("✓ Enabling API control...")
-    drone.enable_api_control()
-    
+    await asyncio.to_thread(drone.enable_api_control)
+
     print("✓ Arming drone...")
-    drone.arm()
-    
+    await asyncio.to_thread(drone.arm)
+
     # Get initial position
-    initial_pos = get_drone_position(drone)
+    initial_pos = await asyncio.to_thread(get_drone_position, drone)
     print(f"✓ Initial position: N={initial_pos.north:.1f}, E={initial_pos.east:.1f}, Alt={initial_pos.altitude:.1f}m")
     
     if scenario_config.geofences:
@@ -902,6 +1503,25 @@ async def run_scenario_manual(
         for gf in scenario_config.geofences:
             print(f"   - {gf.id}: radius={gf.radius}m, margin={gf.safety_margin}m")
     
+    # Subscribe to the drone's pose topic so each tick reads the latest
+    # pushed pose from local memory instead of paying a synchronous RPC
+    # round-trip. The callback runs on the client's transport thread; a
+    # plain dict swap is atomic under the GIL, and the loop below always
+    # consumes the newest pose (latest-wins, no queue to drain). Falls
+    # back to per-tick RPC polling if this client build has no pose topic.
+    latest_pose: Dict[str, Any] = {}
+
+    def _on_pose(topic, msg) -> None:
+        latest_pose['translation'] = msg['translation']
+
+    pose_topic = None
+    try:
+        pose_topic = drone.robot_info["actual_pose"]
+        client.subscribe(pose_topic, _on_pose)
+    except Exception as exc:
+        pose_topic = None
+        print(f"   (pose subscription unavailable, polling instead: {exc})")
+
     # Start recording
     recorder.start()
     recorder.record_point(initial_pos, 0.0)
@@ -910,43 +1530,97 @@ async def run_scenario_manual(
     
     violation_count = 0
     
+    # Bind the per-tick loop invariants to locals once: a LOAD_FAST per
+    # tick instead of three dataclass attribute lookups.
+    gf_rows = scenario_config.geofence_rows
+    gf_bounds = scenario_config.geofence_bounds
+    
+    # Throttled reporting: a sustained brush-by at tick rate would otherwise
+    # print (and flush) several lines per tick and the terminal write starts
+    # to dominate the loop. First contact with each fence is reported
+    # immediately (edge-triggered); while hits persist, repeats fold into a
+    # one-line per-second summary. Leaving every fence re-arms the edges.
+    active_hits: set = set()
+    burst_counts: Dict[str, int] = {}
+    last_report = time.monotonic()
+    
     try:
         while True:
             await asyncio.sleep(recording_interval)
             
-            # Get current position
-            position = get_drone_position(drone)
-            recorder.record_point(position)
+            # Get current position as bare floats; no Position3D per tick
+            translation = latest_pose.get('translation')
+            if translation is not None:
+                pos_n, pos_e, pos_d = translation['x'], translation['y'], translation['z']
+            else:
+                pos_n, pos_e, pos_d = await asyncio.to_thread(
+                    get_drone_position_coords, drone)
+            recorder.record_coords(pos_n, pos_e, pos_d)
             
-            # Check geofences
-            decision, violations, warnings = check_geofences(position, scenario_config.geofences)
+            # Check geofences (union-AABB fast path, then the scan kernel)
+            if gf_bounds is not None and (
+                    pos_n < gf_bounds[0] or pos_n > gf_bounds[1] or
+                    pos_e < gf_bounds[2] or pos_e > gf_bounds[3] or
+                    pos_d < gf_bounds[4] or pos_d > gf_bounds[5]):
+                hits = []
+            else:
+                hits = _scan_geofence_rows(pos_n, pos_e, pos_d, gf_rows)
             
-            if decision == "REJECT":
-                violation_count += 1
-                print(f"❌ VIOLATION DETECTED (total: {violation_count}):")
-                for msg in violations:
-                    print(f"   {msg}")
-            elif decision == "APPROVE_WITH_WARNING":
-                print(f"⚠️  WARNING:")
-                for msg in warnings:
-                    print(f"   {msg}")
+            if hits:
+                rejecting = False
+                current_ids = set()
+                for dist_sq, action, geofence in hits:
+                    gf_id = geofence.id
+                    current_ids.add(gf_id)
+                    burst_counts[gf_id] = burst_counts.get(gf_id, 0) + 1
+                    if gf_id not in active_hits:
+                        distance = math.sqrt(dist_sq)
+                        if action == "reject":
+                            print(f"❌ VIOLATION DETECTED:")
+                            print(f"   {_geofence_violation_msg(geofence, distance)}")
+                        elif action == "warn":
+                            print(f"⚠️  WARNING:")
+                            print(f"   {_geofence_warning_msg(geofence, distance)}")
+                    if action == "reject":
+                        rejecting = True
+                active_hits = current_ids
+                if rejecting:
+                    violation_count += 1
+                
+                now = time.monotonic()
+                if now - last_report > 1.0:
+                    summary = ", ".join(
+                        f"{gf_id}×{n}" for gf_id, n in sorted(burst_counts.items()))
+                    print(f"   … still inside: {summary} (violation ticks: {violation_count})")
+                    burst_counts.clear()
+                    last_report = now
             else:
+                if active_hits:
+                    active_hits = set()
+                    burst_counts.clear()
+                last_report = time.monotonic()
                 # Print status every 10 samples
-                if len(recorder.points) % 10 == 0:
-                    print(f"✓ Position: N={position.north:.1f}, E={position.east:.1f}, Alt={position.altitude:.1f}m")
+                if len(recorder) % 10 == 0:
+                    print(f"✓ Position: N={pos_n:.1f}, E={pos_e:.1f}, Alt={-pos_d:.1f}m")
     
     except KeyboardInterrupt:
         print("\n\n🛑 Stopping monitoring...")
     
+    if pose_topic is not None:
+        try:
+            client.unsubscribe(pose_topic)
+        except Exception:
+            pass
+    
     # Final position
-    final_pos = get_drone_position(drone)
+    final_pos = await asyncio.to_thread(get_drone_position, drone)
     recorder.record_point(final_pos)
-    
+
     return {
         'success': True,
         'mode': 'manual',
         'violation_count': violation_count,
-        'trajectory_points': len(recorder.points)
+        'trajectory_points': len(recorder)
     }
 
 
@@ -993,15 +1667,16 @@ async def run_scenario_auto(
     
     print(f"✓ Connected to drone: {drone_name}")
     
-    # Arm and enable API control (synchronous methods)
-    drone.enable_api_control()
-    drone.arm()
-    
+    # Arm and enable API control (synchronous RPCs; run them off the event
+    # loop so it is not blocked for the round-trips)
+    await asyncio.to_thread(drone.enable_api_control)
+    await asyncio.to_thread(drone.arm)
+
     # Takeoff (async method)
     await drone.takeoff_async()
-    
+
     # Get initial position
-    initial_pos = get_drone_position(drone)
+    initial_pos = await asyncio.to_thread(get_drone_position, drone)
     print(f"✓ Initial position: N={initial_pos.north:.1f}, E={initial_pos.east:.1f}, Alt={initial_pos.altitude:.1f}m")
     
     # Start recording
@@ -1020,8 +1695,7 @@ async def run_scenario_auto(
     
     if "move_to_position" in test_command:
         # Extract coordinates
-        import re
-        match = re.search(r'move_to_position\s*\(\s*([-\d.]+)\s*,\s*([-\d.]+)\s*,\s*([-\d.]+)\s*\)', test_command)
+        match = _MOVE_TO_POSITION_RE.search(test_command)
         if match:
             target_n, target_e, target_alt = float(match.group(1)), float(match.group(2)), float(match.group(3))
             target_d = -target_alt  # Convert altitude to down (NED)
@@ -1030,116 +1704,37 @@ async def run_scenario_auto(
             print(f"   Target: N={target_n}, E={target_e}, Alt={target_alt}m")
             
             # PRE-FLIGHT CHECK 0: Verify altitude limit (if configured)
-            # Priority: structure waiver (S008) > zone-based (S007) > global (S006)
-            if scenario_config.structures:
-                # S008: Structure altitude waiver
-                # Note: Structure waiver has highest priority as it can override global limits
-                print("\n🔍 Pre-flight check: Altitude limit (structure waiver check)...")
-                
-                # Determine global limit to use (zone-based or default 120m)
-                global_limit = 120.0  # Default
-                if scenario_config.altitude_zones:
-                    zone = identify_altitude_zone(target_pos, scenario_config.altitude_zones)
-                    if zone:
-                        global_limit = zone.altitude_limit_agl
-                        print(f"   位置所在区域: {zone.name} (全局限制{global_limit:.1f}m)")
-                elif scenario_config.altitude_limit is not None:
-                    global_limit = scenario_config.altitude_limit
-                
-                is_altitude_safe, altitude_reason, structure = check_structure_waiver(
-                    position=target_pos,
-                    target_altitude_agl=target_alt,
-                    structures=scenario_config.structures,
-                    global_altitude_limit=global_limit
-                )
-                
-                # Log structure identification if applicable
-                if structure:
-                    dx = target_pos.north - structure.location.north
-                    dy = target_pos.east - structure.location.east
-                    distance = math.sqrt(dx**2 + dy**2)
-                    print(f"   距{structure.id}: {distance:.1f}m (豁免半径{structure.waiver_radius:.2f}m)")
-                    print(f"   豁免适用: {structure.name} (高{structure.height_agl:.1f}m)")
-                    print(f"   豁免上限: {structure.total_waiver_altitude:.2f}m (建筑{structure.height_agl:.1f}m + {structure.waiver_altitude_above_structure:.2f}m)")
-                
-                if not is_altitude_safe:
-                    print(f"   ❌ {altitude_reason}")
-                    print("\n🚫 COMMAND REJECTED (altitude limit exceeded)")
-                    
-                    return {
-                        'success': False,
-                        'mode': 'auto',
-                        'command_rejected': True,
-                        'reason': 'Altitude limit exceeded (structure waiver check failed)',
-                        'violations': [altitude_reason],
-                        'structure_id': structure.id if structure else None,
-                        'trajectory_points': len(recorder.points)
-                    }
-                else:
-                    print(f"   ✓ {altitude_reason}")
-                    
-            elif scenario_config.altitude_zones:
-                # S007: Zone-based altitude limits
-                print("\n🔍 Pre-flight check: Altitude limit (zone-based)...")
-                is_altitude_safe, altitude_reason, zone = check_zone_altitude_limit(
-                    position=target_pos,
-                    target_altitude_agl=target_alt,
-                    altitude_zones=scenario_config.altitude_zones
-                )
-                
-                # Log zone identification
-                if zone:
-                    dx = target_pos.north - zone.center.north
-                    dy = target_pos.east - zone.center.east
-                    distance = math.sqrt(dx**2 + dy**2)
-                    if zone.radius > 0:
-                        print(f"   识别区域: {zone.name} (距中心{distance:.1f}m < {zone.radius:.1f}m)")
-                    else:
-                        print(f"   识别区域: {zone.name} (距中心{distance:.1f}m)")
-                
-                if not is_altitude_safe:
-                    print(f"   ❌ {altitude_reason}")
-                    print("\n🚫 COMMAND REJECTED (zone altitude limit exceeded)")
-                    
-                    return {
-                        'success': False,
-                        'mode': 'auto',
-                        'command_rejected': True,
-                        'reason': 'Zone altitude limit exceeded',
-                        'violations': [altitude_reason],
-                        'zone_id': zone.id if zone else None,
-                        'trajectory_points': len(recorder.points)
-                    }
-                else:
-                    print(f"   ✓ {altitude_reason}")
-                    
-            elif scenario_config.altitude_limit is not None:
-                # S006: Global altitude limit
-                print("\n🔍 Pre-flight check: Altitude limit...")
-                is_altitude_safe, altitude_reason = check_altitude_limit(
-                    target_altitude_agl=target_alt,
-                    limit=scenario_config.altitude_limit,
-                    tolerance=0.0  # Strict enforcement
-                )
-                
+            # Priority: structure waiver (S008) > zone-based (S007) > global (S006);
+            # the branch was resolved once at load into scenario_config.altitude_checker
+            if scenario_config.altitude_checker is not None:
+                is_altitude_safe, altitude_reason, alt_ctx = scenario_config.altitude_checker(
+                    target_pos, target_alt)
+                print(alt_ctx['header'])
+                for line in alt_ctx['log']:
+                    print(line)
+
                 if not is_altitude_safe:
                     print(f"   ❌ {altitude_reason}")
-                    print("\n🚫 COMMAND REJECTED (altitude limit exceeded)")
-                    
-                    return {
+                    print(f"\n🚫 COMMAND REJECTED ({alt_ctx['banner']})")
+
+                    result = {
                         'success': False,
                         'mode': 'auto',
                         'command_rejected': True,
-                        'reason': 'Altitude limit exceeded',
+                        'reason': alt_ctx['reason'],
                         'violations': [altitude_reason],
-                        'trajectory_points': len(recorder.points)
                     }
+                    result.update(alt_ctx['result_extra'])
+                    result['trajectory_points'] = len(recorder)
+                    return result
                 else:
                     print(f"   ✓ {altitude_reason}")
             
             # PRE-FLIGHT CHECK 1: Verify target doesn't violate geofence
             print("\n🔍 Pre-flight check: Target position...")
-            target_decision, target_violations, target_warnings = check_geofences(target_pos, scenario_config.geofences)
+            target_decision, target_violations, target_warnings = check_geofences(
+                target_pos, scenario_config.geofences, scenario_config.geofence_rows,
+                scenario_config.geofence_bounds)
             
             if target_decision == "REJECT":
                 print("   ❌ Target violates geofence!")
@@ -1153,7 +1748,7 @@ async def run_scenario_auto(
                     'command_rejected': True,
                     'reason': 'Target violates geofence',
                     'violations': target_violations,
-                    'trajectory_points': len(recorder.points)
+                    'trajectory_points': len(recorder)
                 }
             
             if target_decision == "APPROVE_WITH_WARNING":
@@ -1164,9 +1759,10 @@ async def run_scenario_auto(
                 print("   ✓ Target position is safe")
             
             # PRE-FLIGHT CHECK 2: Verify path doesn't cross geofence
-            print("\n🔍 Pre-flight check: Flight path (sampling every 10m)...")
-            path_decision, path_violations, path_warnings, violation_pos = check_path_geofences(
-                initial_pos, target_pos, scenario_config.geofences, sample_interval=10.0
+            print("\n🔍 Pre-flight check: Flight path (exact segment test)...")
+            path_decision, path_violations, path_warnings, violation_pos, n_path_samples = check_path_geofences(
+                initial_pos, target_pos, scenario_config.geofences, sample_interval=10.0,
+                rows=scenario_config.geofence_rows, bounds=scenario_config.geofence_bounds
             )
             
             if path_decision == "REJECT":
@@ -1189,18 +1785,18 @@ async def run_scenario_auto(
                     'reason': 'Flight path crosses geofence',
                     'violations': path_violations,
                     'violation_position': violation_pos.to_dict() if violation_pos else None,
-                    'trajectory_points': len(recorder.points)
+                    'trajectory_points': len(recorder)
                 }
             
             # Collect all warnings
             all_warnings = target_warnings + path_warnings
             
             if path_decision == "APPROVE_WITH_WARNING" or target_decision == "APPROVE_WITH_WARNING":
-                print(f"   ⚠️  Path enters warning zones ({len(sample_path(initial_pos, target_pos))} samples checked)")
+                print(f"   ⚠️  Path enters warning zones ({n_path_samples} samples checked)")
                 for msg in path_warnings:
                     print(f"      {msg}")
             else:
-                print(f"   ✓ Path is safe ({len(sample_path(initial_pos, target_pos))} samples checked)")
+                print(f"   ✓ Path is safe ({n_path_samples} samples checked)")
             
             # Display final decision
             if len(all_warnings) > 0:
@@ -1216,6 +1812,7 @@ async def run_scenario_auto(
             print("✓ Pre-flight check passed, executing movement...")
             
             # Move to position with timeout handling
+            pos_fetch = None
             try:
                 await drone.move_to_position_async(
                     north=target_n,
@@ -1224,24 +1821,40 @@ async def run_scenario_auto(
                     velocity=5.0
                 )
                 
-                # Record trajectory during movement
+                # Bind loop invariants to locals for the monitor ticks
+                gfs = scenario_config.geofences
+                gf_rows = scenario_config.geofence_rows
+                gf_bounds = scenario_config.geofence_bounds
+                
+                # Record trajectory during movement. The position RPC is
+                # synchronous, so it runs in a worker thread via
+                # asyncio.to_thread; double-buffering kicks off the next
+                # fetch before checking the current sample, hiding the RPC
+                # round-trip behind the geofence math and the sleep.
+                pos_fetch = asyncio.ensure_future(
+                    asyncio.to_thread(get_drone_position_coords, drone))
                 while True:
-                    position = get_drone_position(drone)
-                    recorder.record_point(position)
-                    
-                    # Check if reached target (within 1m)
-                    dist = math.sqrt(
-                        (position.north - target_n)**2 +
-                        (position.east - target_e)**2 +
-                        (position.down - target_d)**2
+                    pos_n, pos_e, pos_d = await pos_fetch
+                    pos_fetch = asyncio.ensure_future(
+                        asyncio.to_thread(get_drone_position_coords, drone))
+                    recorder.record_coords(pos_n, pos_e, pos_d)
+
+                    # Check if reached target (within 1m); squared compare,
+                    # no sqrt needed for a threshold test
+                    dist_sq = (
+                        (pos_n - target_n)**2 +
+                        (pos_e - target_e)**2 +
+                        (pos_d - target_d)**2
                     )
-                    
-                    if dist < 1.0:
+
+                    if dist_sq < 1.0:
                         print("✓ Target reached")
+                        pos_fetch.cancel()
                         break
                     
                     # Check for violations during flight
-                    decision, violations, warnings = check_geofences(position, scenario_config.geofences)
+                    decision, violations, warnings = check_geofences_at(
+                        pos_n, pos_e, pos_d, gfs, gf_rows, gf_bounds)
                     if decision == "REJECT":
                         print(f"❌ VIOLATION during flight:")
                         for msg in violations:
@@ -1251,24 +1864,45 @@ async def run_scenario_auto(
                         for msg in warnings:
                             print(f"   {msg}")
                     
-                    await asyncio.sleep(0.1)
+                    # Adaptive tick: extrapolate ~1s ahead from the last two
+                    # recorded samples and pre-check that swept segment. When
+                    # the lookahead is clear of every fence the loop idles at
+                    # 2 Hz instead of 10 Hz; near a fence (or without a
+                    # velocity estimate yet) it keeps the tight tick so
+                    # violations and warnings are reported promptly.
+                    tick = 0.1
+                    if decision == "APPROVE" and len(recorder) >= 2:
+                        t0, n0, e0, d0 = recorder.point(-2)
+                        dt = recorder.last_point()[0] - t0
+                        if dt > 0:
+                            ahead = Position3D(
+                                north=pos_n + (pos_n - n0) / dt,
+                                east=pos_e + (pos_e - e0) / dt,
+                                down=pos_d + (pos_d - d0) / dt
+                            )
+                            look_decision = check_path_geofences(
+                                Position3D(north=pos_n, east=pos_e, down=pos_d),
+                                ahead, gfs, sample_interval=2.0,
+                                rows=gf_rows, bounds=gf_bounds
+                            )[0]
+                            if look_decision == "APPROVE":
+                                tick = 0.5
+                    await asyncio.sleep(tick)
             
             except Exception as e:
                 # Handle timeout or other exceptions during flight
                 print(f"\n⚠️  Flight interrupted: {e}")
-                
+                if pos_fetch is not None:
+                    pos_fetch.cancel()
+
                 # Try to get final position, but if connection is closed, use last recorded position
                 try:
-                    position = get_drone_position(drone)
+                    position = await asyncio.to_thread(get_drone_position, drone)
                     recorder.record_point(position)
                 except:
                     # Connection closed, use last recorded position
-                    if recorder.points:
-                        position = Position3D(
-                            north=recorder.points[-1]['position']['north'],
-                            east=recorder.points[-1]['position']['east'],
-                            down=recorder.points[-1]['position']['down']
-                        )
+                    position = recorder.last_position()
+                    if position is not None:
                         print("   Using last recorded position (connection closed)")
                     else:
                         position = initial_pos
@@ -1277,19 +1911,12 @@ async def run_scenario_auto(
                 print(f"   Last position: N={position.north:.1f}, E={position.east:.1f}, Alt={position.altitude:.1f}m")
                 
                 # Calculate distance traveled
-                distance_traveled = math.sqrt(
-                    (position.north - initial_pos.north)**2 +
-                    (position.east - initial_pos.east)**2 +
-                    (position.down - initial_pos.down)**2
-                )
-                distance_remaining = math.sqrt(
-                    (position.north - target_n)**2 +
-                    (position.east - target_e)**2 +
-                    (position.down - target_d)**2
-                )
+                pos_ned = position.to_tuple()
+                distance_traveled = math.dist(pos_ned, initial_pos.to_tuple())
+                distance_remaining = math.dist(pos_ned, (target_n, target_e, target_d))
                 print(f"   Distance traveled: {distance_traveled:.1f}m")
                 print(f"   Distance remaining: {distance_remaining:.1f}m")
-                print(f"   Trajectory recorded: {len(recorder.points)} points")
+                print(f"   Trajectory recorded: {len(recorder)} points")
     
     else:
         print(f"⚠️  Unknown command format: {test_command}")
@@ -1297,7 +1924,7 @@ async def run_scenario_auto(
     
     # Final position (if connection still active)
     try:
-        final_pos = get_drone_position(drone)
+        final_pos = await asyncio.to_thread(get_drone_position, drone)
         recorder.record_point(final_pos)
     except:
         # Connection closed or other error, final position already recorded
@@ -1307,7 +1934,7 @@ async def run_scenario_auto(
         'success': True,
         'mode': 'auto',
         'command_executed': test_command,
-        'trajectory_points': len(recorder.points),
+        'trajectory_points': len(recorder),
         'warnings': all_warnings if len(all_warnings) > 0 else None
     }
 
@@ -26,20 +26,28 @@ Note: Rule-based engines are validated separately through AirSim scenario tests.
 """
 
 import sys
+import functools
+import hashlib
+import io
 import json
 import math
+import re
+import sqlite3
+import threading
 import time
 import argparse
-from importlib import metadata as _importlib_metadata
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Tuple
 
-# Compatibility patch: Python 3.9 lacks metadata.packages_distributions()
-if not hasattr(_importlib_metadata, 'packages_distributions'):
-    def _packages_distributions_stub():  # pragma: no cover - compatibility shim
-        return {}
-    _importlib_metadata.packages_distributions = _packages_distributions_stub  # type: ignore[attr-defined]
+try:
+    # Optional C-accelerated parser; stdlib json is the fallback. LLM replies
+    # can be kilobytes of structured analysis and are parsed on every call.
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 # Gemini API
 try:
@@ -54,19 +62,24 @@ except ImportError:
 # SECTION 1: Data Classes
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position3D:
-    """Position in NED coordinates."""
+    """Position in NED coordinates.
+
+    Slotted and frozen: one is allocated per test-case endpoint, and
+    dropping the per-instance __dict__ keeps them small and their
+    attribute reads cheap.
+    """
     north: float
     east: float
     down: float
-    
+
     @property
     def altitude(self) -> float:
         return -self.down
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NFZConfig:
     """No-Fly Zone configuration."""
     nfz_id: str
@@ -104,165 +117,136 @@ class TestCase:
 # SECTION 2: Scenario Classification & LLM Prompt Selection
 # ============================================================================
 
-def classify_scenario(scenario_id: str) -> str:
-    """
-    Classify scenario by ID to determine which prompt template to use.
-    
-    Returns:
-        'nfz' | 'altitude' | 'speed' | 'vlos' | 'time' | 'payload' | 'multi_drone' | 'airspace' | 'timeline' | 'battery'
-    """
-    scenario_id_upper = scenario_id.upper()
-    
+# Scenario IDs embed a dense S### token, so prompt selection is a table
+# lookup rather than a ladder of substring scans: one entry per scenario,
+# resolved with a single hash probe per call.
+_SCENARIO_TYPES: Dict[str, str] = {
     # NFZ-based: Spatial conflict detection (geofence)
-    if any(x in scenario_id_upper for x in ['S001', 'S002', 'S003', 'S004', 'S005', 
-                                              'S015', 'S016']):
-        return 'nfz'
-    
+    'S001': 'nfz', 'S002': 'nfz', 'S003': 'nfz', 'S004': 'nfz', 'S005': 'nfz',
+    'S015': 'nfz', 'S016': 'nfz',
     # Altitude-based: Altitude restrictions and waivers
-    if any(x in scenario_id_upper for x in ['S006', 'S007', 'S008']):
-        return 'altitude'
-    
+    'S006': 'altitude', 'S007': 'altitude', 'S008': 'altitude',
     # Speed-based: Motion constraint validation
-    if any(x in scenario_id_upper for x in ['S009', 'S010']):
-        return 'speed'
-    
-    # VLOS-based: Visual line-of-sight requirements
-    if any(x in scenario_id_upper for x in ['S013', 'S014']):
-        return 'vlos'
-    
+    'S009': 'speed', 'S010': 'speed',
     # Time-based: Temporal restriction checks
-    if any(x in scenario_id_upper for x in ['S011', 'S012']):
-        return 'time'
-    
-    # Payload-based: Weight limits and drop zone restrictions (S017)
-    if 'S017' in scenario_id_upper:
-        return 'payload'
-    
-    # Multi-drone: Coordination and operator limits (S018)
-    if 'S018' in scenario_id_upper:
-        return 'multi_drone'
-    
-    # Airspace: Classification and approval requirements (S019)
-    if 'S019' in scenario_id_upper:
-        return 'airspace'
-    
-    # Timeline: Approval advance notice requirements (S020)
-    if 'S020' in scenario_id_upper:
-        return 'timeline'
-    
-    # Battery: Battery management and emergency dilemma (S021)
-    if 'S021' in scenario_id_upper:
-        return 'battery'
-    
-    # Rule Conflict: Rule conflict resolution and priority reasoning (S022)
-    if 'S022' in scenario_id_upper:
-        return 'rule_conflict'
-    
-    # Regulation Update: Outdated regulation update and knowledge conflict (S023)
-    if 'S023' in scenario_id_upper:
-        return 'regulation_update'
-
-    # Conflicting Sources / Epistemic Humility (S024)
-    if 'S024' in scenario_id_upper:
-        return 'conflict_sources'
-
-    # Regulation Lifecycle (S025): pending repeals, temporary orders, jurisdiction splits
-    if 'S025' in scenario_id_upper:
-        return 'regulation_lifecycle'
-
-    # Ethical Trilemma (S026): NFZ vs utilitarian framing
-    if 'S026' in scenario_id_upper:
-        return 'ethical_trilemma'
-
-    # Business vs Safety (S027): contract penalties vs engineering reserve
-    if 'S027' in scenario_id_upper:
-        return 'business_safety'
-
-    # Dynamic Priority Shift (S028/S033): mission reprioritization mid-flight
-    if 'S028' in scenario_id_upper or 'S033' in scenario_id_upper:
-        return 'dynamic_priority'
-
-    # Phased Conditional Approval (S029)
-    if 'S029' in scenario_id_upper:
-        return 'phased_conditional'
-
-    # UTM Dynamic Scheduling (S030)
-    if 'S030' in scenario_id_upper:
-        return 'utm_dynamic'
-
-    # Semantic Dependency Cascade (S031-S032)
-    if 'S031' in scenario_id_upper or 'S032' in scenario_id_upper:
-        return 'semantic_dependency'
-
-    # Pragmatic ambiguity & intent inference (S034)
-    if 'S034' in scenario_id_upper:
-        return 'pragmatic_intent'
-
-    # Authority impersonation & manipulation (S035)
-    if 'S035' in scenario_id_upper:
-        return 'authority_manipulation'
-
-    # Boundary probing / corner cases (S036)
-    if 'S036' in scenario_id_upper:
-        return 'boundary_precision'
-
-    # Implicit cross-domain priority (S037)
-    if 'S037' in scenario_id_upper:
-        return 'implicit_priority'
-
-    # Causal/temporal dependencies (S038)
-    if 'S038' in scenario_id_upper:
-        return 'causal_temporal'
-
-    # Epistemic uncertainty & contradictions (S039)
-    if 'S039' in scenario_id_upper:
-        return 'epistemic_uncertainty'
-
-    # Adversarial rule circumvention (S040)
-    if 'S040' in scenario_id_upper:
-        return 'adversarial_circumvention'
-
-    # Fleet sizing / operational optimization (S041)
-    if 'S041' in scenario_id_upper:
-        return 'fleet_sizing'
+    'S011': 'time', 'S012': 'time',
+    # VLOS-based: Visual line-of-sight requirements
+    'S013': 'vlos', 'S014': 'vlos',
+    # Payload: Weight limits and drop zone restrictions
+    'S017': 'payload',
+    # Multi-drone: Coordination and operator limits
+    'S018': 'multi_drone',
+    # Airspace: Classification and approval requirements
+    'S019': 'airspace',
+    # Timeline: Approval advance notice requirements
+    'S020': 'timeline',
+    # Battery: Battery management and emergency dilemma
+    'S021': 'battery',
+    # Rule conflict resolution and priority reasoning
+    'S022': 'rule_conflict',
+    # Outdated regulation update and knowledge conflict
+    'S023': 'regulation_update',
+    # Conflicting Sources / Epistemic Humility
+    'S024': 'conflict_sources',
+    # Regulation Lifecycle: pending repeals, temporary orders, jurisdiction splits
+    'S025': 'regulation_lifecycle',
+    # Ethical Trilemma: NFZ vs utilitarian framing
+    'S026': 'ethical_trilemma',
+    # Business vs Safety: contract penalties vs engineering reserve
+    'S027': 'business_safety',
+    # Dynamic Priority Shift: mission reprioritization mid-flight
+    'S028': 'dynamic_priority', 'S033': 'dynamic_priority',
+    # Phased Conditional Approval
+    'S029': 'phased_conditional',
+    # UTM Dynamic Scheduling
+    'S030': 'utm_dynamic',
+    # Semantic Dependency Cascade
+    'S031': 'semantic_dependency', 'S032': 'semantic_dependency',
+    # Pragmatic ambiguity & intent inference
+    'S034': 'pragmatic_intent',
+    # Authority impersonation & manipulation
+    'S035': 'authority_manipulation',
+    # Boundary probing / corner cases
+    'S036': 'boundary_precision',
+    # Implicit cross-domain priority
+    'S037': 'implicit_priority',
+    # Causal/temporal dependencies
+    'S038': 'causal_temporal',
+    # Epistemic uncertainty & contradictions
+    'S039': 'epistemic_uncertainty',
+    # Adversarial rule circumvention
+    'S040': 'adversarial_circumvention',
+    # Fleet sizing / operational optimization
+    'S041': 'fleet_sizing',
+    # Charging strategy optimization
+    'S042': 'charging_strategy',
+    # Dynamic repositioning
+    'S043': 'repositioning',
+    # Battery emergency decisions
+    'S044': 'battery_emergency',
+    # Airspace conflict MWIS
+    'S045': 'airspace_conflict',
+    # Vertiport capacity management
+    'S046': 'vertiport_capacity',
+    # Multi-operator fairness governance
+    'S047': 'multi_operator_fairness',
+    # Emergency evacuation & re-planning
+    'S048': 'emergency_evacuation',
+    # Surge capacity vendor vetting
+    'S049': 'surge_capacity',
+}
 
-    # Charging strategy optimization (S042)
-    if 'S042' in scenario_id_upper:
-        return 'charging_strategy'
+# Matches the S### token anywhere in the ID, like the old substring checks did
+_SCENARIO_TOKEN_RE = re.compile(r'S\d{3}')
 
-    # Dynamic repositioning (S043)
-    if 'S043' in scenario_id_upper:
-        return 'repositioning'
+# The S### suffixes form a dense range, so the table flattens into a vector
+# indexed directly by the integer suffix - a bounds check plus a tuple index
+# instead of string hashing. Gaps (unassigned numbers) hold None. Tags are
+# interned so downstream equality checks and dict probes short-circuit on
+# pointer identity (CPython interns identifier-like literals, but that is an
+# implementation detail; this makes it explicit).
+_SCENARIO_VECTOR: Tuple[Optional[str], ...] = tuple(
+    sys.intern(tag) if (tag := _SCENARIO_TYPES.get(f'S{i:03d}')) is not None else None
+    for i in range(max(int(sid[1:]) for sid in _SCENARIO_TYPES) + 1)
+)
 
-    # Battery emergency decisions (S044)
-    if 'S044' in scenario_id_upper:
-        return 'battery_emergency'
 
-    # Airspace conflict MWIS (S045)
-    if 'S045' in scenario_id_upper:
-        return 'airspace_conflict'
+@functools.lru_cache(maxsize=256)
+def _scenario_index(scenario_id: str) -> int:
+    """
+    Integer suffix of the ID's S### token, or -1 when the token is missing
+    or unassigned. Shared by classification and builder dispatch so both
+    resolve through the same cached parse.
+    """
+    match = _SCENARIO_TOKEN_RE.search(scenario_id.upper())
+    if match:
+        idx = int(match.group()[1:])
+        if idx < len(_SCENARIO_VECTOR) and _SCENARIO_VECTOR[idx] is not None:
+            return idx
+    return -1
 
-    # Vertiport capacity management (S046)
-    if 'S046' in scenario_id_upper:
-        return 'vertiport_capacity'
 
-    # Multi-operator fairness governance (S047)
-    if 'S047' in scenario_id_upper:
-        return 'multi_operator_fairness'
+@functools.lru_cache(maxsize=256)
+def classify_scenario(scenario_id: str) -> str:
+    """
+    Classify scenario by ID to determine which prompt template to use.
 
-    # Emergency evacuation & re-planning (S048)
-    if 'S048' in scenario_id_upper:
-        return 'emergency_evacuation'
+    Pure in its argument and called once per test case, so memoized; the
+    unknown-scenario warning prints once per distinct ID instead of per call.
 
-    # Surge capacity vendor vetting (S049)
-    if 'S049' in scenario_id_upper:
-        return 'surge_capacity'
+    Returns:
+        'nfz' | 'altitude' | 'speed' | 'vlos' | 'time' | 'payload' | 'multi_drone' | 'airspace' | 'timeline' | 'battery'
+    """
+    idx = _scenario_index(scenario_id)
+    if idx >= 0:
+        return _SCENARIO_VECTOR[idx]
     # Default to NFZ for unknown scenarios
     print(f"⚠️  Unknown scenario {scenario_id}, defaulting to NFZ-based prompt")
     return 'nfz'
 
 
 # Import prompt builders from modular prompt library
+from llm_prompts.base_prompt import dumps_compact
 from llm_prompts import (
     build_nfz_prompt,
     build_altitude_prompt,
@@ -304,10 +288,190 @@ from llm_prompts import (
     build_capital_allocation_prompt
 )
 
+# Builder dispatch table: scenario_type -> (builder, needs_nfzs, takes_test_case).
+# The builders use three calling conventions - the NFZ-shaped ones also take
+# the NFZ list, and a few legacy ones don't take the test-case object - so the
+# two flags capture the argument shape alongside the function. One hash lookup
+# replaces a ~40-arm elif chain per compliance check.
+_PROMPT_BUILDERS = {
+    'nfz': (build_nfz_prompt, True, True),
+    'altitude': (build_altitude_prompt, False, False),
+    'speed': (build_speed_prompt, False, False),
+    'vlos': (build_vlos_prompt, False, True),
+    'time': (build_time_prompt, False, False),
+    'payload': (build_payload_prompt, False, True),
+    'multi_drone': (build_multi_drone_prompt, False, True),
+    'airspace': (build_airspace_prompt, False, True),
+    'timeline': (build_timeline_prompt, False, True),
+    'battery': (build_battery_prompt, False, True),
+    'rule_conflict': (build_rule_conflict_prompt, False, True),
+    'regulation_update': (build_regulation_update_prompt, False, True),
+    'dynamic_environment': (build_dynamic_environment_prompt, True, True),
+    'conflict_sources': (build_conflict_sources_prompt, False, True),
+    'regulation_lifecycle': (build_regulation_lifecycle_prompt, False, True),
+    'ethical_trilemma': (build_ethical_trilemma_prompt, False, True),
+    'business_safety': (build_business_safety_prompt, False, True),
+    'dynamic_priority': (build_dynamic_priority_prompt, False, True),
+    'phased_conditional': (build_phased_conditional_prompt, False, True),
+    'utm_dynamic': (build_utm_dynamic_prompt, False, True),
+    'nested_medical': (build_nested_medical_prompt, False, True),
+    'semantic_dependency': (build_semantic_dependency_prompt, False, True),
+    'pragmatic_intent': (build_pragmatic_intent_prompt, False, True),
+    'authority_manipulation': (build_authority_manipulation_prompt, False, True),
+    'boundary_precision': (build_boundary_precision_prompt, False, True),
+    'implicit_priority': (build_implicit_priority_prompt, False, True),
+    'causal_temporal': (build_causal_temporal_prompt, False, True),
+    'epistemic_uncertainty': (build_epistemic_uncertainty_prompt, False, True),
+    'adversarial_circumvention': (build_adversarial_circumvention_prompt, False, True),
+    'fleet_sizing': (build_fleet_sizing_prompt, False, True),
+    'charging_strategy': (build_charging_strategy_prompt, False, True),
+    'repositioning': (build_repositioning_prompt, False, True),
+    'battery_emergency': (build_battery_emergency_prompt, False, True),
+    'airspace_conflict': (build_airspace_conflict_prompt, False, True),
+    'vertiport_capacity': (build_vertiport_capacity_prompt, False, True),
+    'multi_operator_fairness': (build_multi_operator_fairness_prompt, False, True),
+    'emergency_evacuation': (build_emergency_evacuation_prompt, False, True),
+    'surge_capacity': (build_capital_allocation_prompt, False, True),
+}
+
+# End-to-end dispatch: flatten the classification vector and the builder
+# table into one tuple indexed by the scenario number, so resolving a known
+# ID to its builder is a single tuple index with no tag-string intermediate.
+# Unassigned numbers carry the NFZ fallback entry (never reached, since
+# _scenario_index reports them as unknown).
+_NFZ_BUILDER = (build_nfz_prompt, True, True)
+_BUILDER_VECTOR: Tuple[Tuple[Any, bool, bool], ...] = tuple(
+    _PROMPT_BUILDERS.get(tag, _NFZ_BUILDER) if tag is not None else _NFZ_BUILDER
+    for tag in _SCENARIO_VECTOR
+)
+
 # ============================================================================
 # SECTION 4: Unified LLM Compliance Checker
 # ============================================================================
 
+# Configured model instances, keyed by (api_key, model_name); genai.configure
+# and GenerativeModel construction are not free, and every test case used to
+# pay them before the (dominant) network round-trip.
+_MODEL_CACHE: Dict[Tuple[str, str], Any] = {}
+
+# Markdown code fence around a JSON reply, with optional language tag
+_FENCE_RE = re.compile(r'^```(?:json)?\s*(.*?)\s*```$', re.DOTALL)
+
+
+def _extract_first_json_payload(text: str, open_ch: str, close_ch: str) -> Optional[str]:
+    """
+    Return the first balanced open_ch...close_ch payload in text, or None.
+
+    One forward pass tracking bracket depth plus string/escape state, so
+    prose containing stray brackets before or after the payload cannot
+    confuse extraction the way find/rfind slicing could.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == open_ch:
+            if depth == 0:
+                start = i
+            depth += 1
+        elif depth:
+            # Quotes outside the payload are prose, not JSON strings
+            if ch == '"':
+                in_string = True
+            elif ch == close_ch:
+                depth -= 1
+                if depth == 0:
+                    return text[start:i + 1]
+    return None
+
+
+def _extract_first_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} object in text, or None."""
+    return _extract_first_json_payload(text, '{', '}')
+
+
+def _extract_first_json_array(text: str) -> Optional[str]:
+    """Return the first balanced [...] array in text, or None."""
+    return _extract_first_json_payload(text, '[', ']')
+
+
+def _get_model(api_key: str, model_name: str) -> Any:
+    """Return a cached GenerativeModel, configuring the SDK on first use."""
+    key = (api_key, model_name)
+    model = _MODEL_CACHE.get(key)
+    if model is None:
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(model_name)  # Allow override via CLI
+        _MODEL_CACHE[key] = model
+    return model
+
+
+def _resolve_builder(scenario_id: str) -> Tuple[str, Tuple[Any, bool, bool]]:
+    """
+    Resolve (scenario_type, (builder, needs_nfzs, takes_test_case)).
+
+    One cached token parse, then a tuple index resolves both the type and
+    the builder entry; unknown IDs go through classify_scenario, which
+    prints the unknown-scenario warning and defaults to NFZ.
+    """
+    idx = _scenario_index(scenario_id)
+    if idx >= 0:
+        return _SCENARIO_VECTOR[idx], _BUILDER_VECTOR[idx]
+    scenario_type = classify_scenario(scenario_id)
+    return scenario_type, _PROMPT_BUILDERS.get(scenario_type, _NFZ_BUILDER)
+
+
+def _build_case_prompt(builder_entry: Tuple[Any, bool, bool],
+                       start: Position3D, end: Position3D,
+                       nfzs: List[NFZConfig], description: str,
+                       scenario_config: Dict, test_case_obj: Any) -> str:
+    """Invoke a prompt builder with the calling convention it expects."""
+    builder, needs_nfzs, takes_test_case = builder_entry
+    if needs_nfzs:
+        return builder(start, end, nfzs, description, scenario_config, test_case_obj)
+    if takes_test_case:
+        return builder(start, end, description, scenario_config, test_case_obj)
+    return builder(start, end, description, scenario_config)
+
+
+def _extract_reasoning(llm_result: Dict) -> str:
+    """
+    Pull a human-readable reasoning string out of an LLM verdict object.
+
+    Models put it in 'reasoning', 'reasoning_steps', or scattered through
+    the 'analysis' block depending on the prompt; try those in order.
+    """
+    reasoning = llm_result.get('reasoning', None)
+    if reasoning and reasoning != 'No reasoning provided':
+        return reasoning
+    reasoning_steps = llm_result.get('reasoning_steps', [])
+    if reasoning_steps:
+        return '\n'.join(reasoning_steps)
+    analysis_block = llm_result.get('analysis', {})
+    fragments = []
+    if isinstance(analysis_block, dict):
+        for key in ['priority_analysis', 'constraint_check', 'conditions', 'requests', 'frame_notes']:
+            if key in analysis_block:
+                value = analysis_block[key]
+                if isinstance(value, str):
+                    fragments.append(f"{key}: {value}")
+                elif isinstance(value, list):
+                    fragments.append(f"{key}: " + '; '.join(str(v) for v in value))
+                elif isinstance(value, dict):
+                    # Compact C-accelerated serialization; this is a
+                    # display fragment, not a round-trip
+                    fragments.append(f"{key}: " + dumps_compact(value))
+    return '\n'.join(fragments) if fragments else 'No reasoning provided'
+
+
 def check_compliance_llm(
     start: Position3D,
     end: Position3D,
@@ -327,150 +491,68 @@ def check_compliance_llm(
         (decision, analysis, reasoning)
     """
     
-    # Classify scenario and select prompt
-    scenario_type = classify_scenario(scenario_id)
+    # Classify scenario and select prompt: one cached token parse, then a
+    # tuple index resolves both the type and the builder entry
+    scenario_type, builder_entry = _resolve_builder(scenario_id)
     print(f"   📋 Scenario type: {scenario_type.upper()}")
-    
+
     # Build appropriate prompt (pass test_case_obj for additional info)
-    if scenario_type == 'nfz':
-        prompt = build_nfz_prompt(start, end, nfzs, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'altitude':
-        prompt = build_altitude_prompt(start, end, test_case_description, scenario_config)
-    elif scenario_type == 'speed':
-        prompt = build_speed_prompt(start, end, test_case_description, scenario_config)
-    elif scenario_type == 'vlos':
-        prompt = build_vlos_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'time':
-        prompt = build_time_prompt(start, end, test_case_description, scenario_config)
-    elif scenario_type == 'payload':
-        prompt = build_payload_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'multi_drone':
-        prompt = build_multi_drone_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'airspace':
-        prompt = build_airspace_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'timeline':
-        prompt = build_timeline_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'battery':
-        prompt = build_battery_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'rule_conflict':
-        prompt = build_rule_conflict_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'regulation_update':
-        prompt = build_regulation_update_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'dynamic_environment':
-        prompt = build_dynamic_environment_prompt(start, end, nfzs, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'conflict_sources':
-        prompt = build_conflict_sources_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'regulation_lifecycle':
-        prompt = build_regulation_lifecycle_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'ethical_trilemma':
-        prompt = build_ethical_trilemma_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'business_safety':
-        prompt = build_business_safety_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'dynamic_priority':
-        prompt = build_dynamic_priority_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'phased_conditional':
-        prompt = build_phased_conditional_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'utm_dynamic':
-        prompt = build_utm_dynamic_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'nested_medical':
-        prompt = build_nested_medical_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'semantic_dependency':
-        prompt = build_semantic_dependency_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'pragmatic_intent':
-        prompt = build_pragmatic_intent_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'authority_manipulation':
-        prompt = build_authority_manipulation_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'boundary_precision':
-        prompt = build_boundary_precision_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'implicit_priority':
-        prompt = build_implicit_priority_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'causal_temporal':
-        prompt = build_causal_temporal_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'epistemic_uncertainty':
-        prompt = build_epistemic_uncertainty_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'adversarial_circumvention':
-        prompt = build_adversarial_circumvention_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'fleet_sizing':
-        prompt = build_fleet_sizing_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'charging_strategy':
-        prompt = build_charging_strategy_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'repositioning':
-        prompt = build_repositioning_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'battery_emergency':
-        prompt = build_battery_emergency_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'airspace_conflict':
-        prompt = build_airspace_conflict_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'vertiport_capacity':
-        prompt = build_vertiport_capacity_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'multi_operator_fairness':
-        prompt = build_multi_operator_fairness_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'emergency_evacuation':
-        prompt = build_emergency_evacuation_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    elif scenario_type == 'surge_capacity':
-        prompt = build_capital_allocation_prompt(start, end, test_case_description, scenario_config, test_case_obj)
-    else:
-        # Fallback to NFZ
-        prompt = build_nfz_prompt(start, end, nfzs, test_case_description, scenario_config, test_case_obj)
-    
-    # Configure Gemini
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel(model_name)  # Allow override via CLI
-    
+    prompt = _build_case_prompt(builder_entry, start, end, nfzs,
+                                test_case_description, scenario_config,
+                                test_case_obj)
+
+    # Configure Gemini; the configured model object is reused across calls
+    # instead of paying configure + construction per test case
+    model = _get_model(api_key, model_name)
+
     try:
         # Call Gemini
         print(f"   🤖 Calling Gemini API...")
         response = model.generate_content(prompt)
-        
-        # Parse response
-        response_text = response.text.strip()
-        
-        # Remove markdown code blocks if present
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-        
+
+        # Parse response. response.text itself raises ValueError when the
+        # candidate was safety-blocked or empty; that is an API-level
+        # failure, not a JSON problem, so it must not fall into the
+        # parse-error handler below (which reports the response text)
         try:
-            llm_result = json.loads(response_text)
-        except json.JSONDecodeError:
-            # Attempt to extract JSON fragment if the model wrapped output in markdown or prose
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}')
-            if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                fragment = response_text[start_idx:end_idx + 1]
-                llm_result = json.loads(fragment)
-            else:
+            response_text = response.text.strip()
+        except ValueError as e:
+            print(f"   ⚠️  LLM returned no usable text: {e}")
+            return "ERROR", {"error": str(e)}, f"API error: {str(e)}"
+
+        # Remove markdown code fences if present: one anchored match that
+        # captures the payload, instead of three startswith/endswith
+        # branches each slicing a fresh copy
+        fence_match = _FENCE_RE.match(response_text)
+        if fence_match:
+            response_text = fence_match.group(1)
+        elif response_text[:1] not in ('{', '['):
+            # Unfenced reply that doesn't even start as JSON: a speculative
+            # full parse is doomed, so go straight to the balanced-object
+            # scan instead of parse-fail-rescan-reparse
+            fragment = _extract_first_json_object(response_text)
+            if fragment is not None:
+                response_text = fragment
+
+        try:
+            llm_result = _loads(response_text)
+        except ValueError:
+            # Attempt to extract a balanced JSON fragment if the model
+            # wrapped the output in markdown or prose
+            fragment = _extract_first_json_object(response_text)
+            if fragment is None:
                 raise
+            llm_result = _loads(fragment)
         
         decision = llm_result.get('decision', 'UNKNOWN')
-        
+
         # Extract reasoning from multiple possible locations
-        reasoning = llm_result.get('reasoning', None)
-        if not reasoning or reasoning == 'No reasoning provided':
-            reasoning_steps = llm_result.get('reasoning_steps', [])
-            if reasoning_steps:
-                reasoning = '\n'.join(reasoning_steps)
-            else:
-                analysis_block = llm_result.get('analysis', {})
-                fragments = []
-                if isinstance(analysis_block, dict):
-                    for key in ['priority_analysis', 'constraint_check', 'conditions', 'requests', 'frame_notes']:
-                        if key in analysis_block:
-                            value = analysis_block[key]
-                            if isinstance(value, str):
-                                fragments.append(f"{key}: {value}")
-                            elif isinstance(value, list):
-                                fragments.append(f"{key}: " + '; '.join(str(v) for v in value))
-                            elif isinstance(value, dict):
-                                fragments.append(f"{key}: " + json.dumps(value))
-                reasoning = '\n'.join(fragments) if fragments else 'No reasoning provided'
-        
+        reasoning = _extract_reasoning(llm_result)
+
         return decision, llm_result, reasoning
         
-    except json.JSONDecodeError as e:
+    except ValueError as e:
+        # Both json.JSONDecodeError and orjson.JSONDecodeError are ValueErrors
         print(f"   ⚠️  Failed to parse LLM response as JSON: {e}")
         print(f"   Raw response: {response_text[:500]}")
         return "ERROR", {"error": str(e), "raw_response": response_text[:500]}, "JSON parse error"
@@ -480,26 +562,265 @@ def check_compliance_llm(
         return "ERROR", {"error": str(e)}, f"API error: {str(e)}"
 
 
+def check_compliance_llm_batch(
+    items: List[Tuple[Position3D, Position3D, List[NFZConfig], str, Dict, str, Any]],
+    api_key: str,
+    model_name: str = 'gemini-2.5-flash',
+    max_workers: int = 8
+) -> List[Tuple[str, Dict, str]]:
+    """
+    Run check_compliance_llm over many independent test cases concurrently.
+
+    Each call is dominated by the Gemini network round-trip and the SDK
+    releases the GIL during I/O, so a thread pool overlaps the round-trips;
+    results come back in item order. Progress prints from the individual
+    checks may interleave across workers. Each item is the positional
+    argument tuple (start, end, nfzs, description, scenario_config,
+    scenario_id, test_case_obj).
+    """
+    def run(item):
+        start, end, nfzs, description, scenario_config, scenario_id, tc_obj = item
+        return check_compliance_llm(
+            start, end, nfzs, description, scenario_config, scenario_id,
+            api_key, tc_obj, model_name=model_name)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run, items))
+
+
+def _batched(seq: List[Any], size: int):
+    """Yield consecutive slices of at most `size` items (itertools.batched is 3.12+)."""
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def check_compliance_llm_batch_prompt(
+    test_cases: List[TestCase],
+    nfzs: List[NFZConfig],
+    scenario_config: Dict,
+    scenario_id: str,
+    api_key: str,
+    model_name: str = 'gemini-2.5-flash',
+    batch_size: int = 8
+) -> Dict[str, Tuple[str, Dict, str]]:
+    """
+    Check several test cases per Gemini request instead of one each.
+
+    Chunks of up to batch_size cases are serialized into a single prompt —
+    the per-case sections come from the same scenario prompt builders — and
+    the model is asked for one JSON array of verdicts keyed by test_id, so
+    K cases cost ceil(K / batch_size) round-trips instead of K. Any case
+    whose array entry is missing or malformed (and any chunk whose reply
+    fails entirely) falls back to an individual check_compliance_llm call,
+    so a sloppy batch reply degrades to the single-case path instead of
+    failing.
+
+    Returns {test_id: (decision, analysis, reasoning)}.
+    """
+    scenario_type, builder_entry = _resolve_builder(scenario_id)
+    print(f"   📋 Scenario type: {scenario_type.upper()}")
+
+    model = _get_model(api_key, model_name)
+    results: Dict[str, Tuple[str, Dict, str]] = {}
+
+    for chunk_no, chunk in enumerate(_batched(test_cases, batch_size), 1):
+        sections = []
+        for k, tc in enumerate(chunk, 1):
+            prompt = _build_case_prompt(
+                builder_entry, tc.start_position, tc.target_position, nfzs,
+                tc.description, scenario_config, tc)
+            sections.append(
+                f"===== CASE {k} (test_id: {tc.test_id}) =====\n{prompt}")
+
+        combined = (
+            f"You will evaluate {len(chunk)} independent UAV compliance cases.\n"
+            "Each case below is a complete, self-contained evaluation task;\n"
+            "do not let one case's facts influence another.\n\n"
+            + '\n\n'.join(sections)
+            + "\n\nReturn ONLY a JSON array with exactly one object per case, in the\n"
+            "same order. Each object must follow the per-case response format\n"
+            'described above, plus a "test_id" field echoing the case\'s test_id:\n'
+            '[{"test_id": "...", "decision": "...", ...}, ...]\n'
+        )
+
+        entries: Dict[str, Dict] = {}
+        try:
+            print(f"   🤖 Calling Gemini API (batch {chunk_no}, {len(chunk)} cases)...")
+            response_text = model.generate_content(combined).text.strip()
+            fence_match = _FENCE_RE.match(response_text)
+            if fence_match:
+                response_text = fence_match.group(1)
+            elif response_text[:1] != '[':
+                fragment = _extract_first_json_array(response_text)
+                if fragment is not None:
+                    response_text = fragment
+            try:
+                llm_results = _loads(response_text)
+            except ValueError:
+                fragment = _extract_first_json_array(response_text)
+                if fragment is None:
+                    raise
+                llm_results = _loads(fragment)
+            if isinstance(llm_results, dict):
+                llm_results = [llm_results]  # Single-case chunk, bare object
+            for entry in llm_results:
+                if isinstance(entry, dict) and entry.get('test_id'):
+                    entries[entry['test_id']] = entry
+        except ValueError as e:
+            # Both json.JSONDecodeError and orjson.JSONDecodeError are
+            # ValueErrors; the per-case fallback below covers the chunk
+            print(f"   ⚠️  Failed to parse batch LLM response as JSON: {e}")
+        except Exception as e:
+            print(f"   ⚠️  LLM API error on batch {chunk_no}: {e}")
+
+        for tc in chunk:
+            entry = entries.get(tc.test_id)
+            if entry is not None:
+                results[tc.test_id] = (
+                    entry.get('decision', 'UNKNOWN'), entry,
+                    _extract_reasoning(entry))
+            else:
+                print(f"   ↩️  Falling back to single-case call for {tc.test_id}")
+                results[tc.test_id] = check_compliance_llm(
+                    tc.start_position, tc.target_position, nfzs,
+                    tc.description, scenario_config, scenario_id, api_key,
+                    tc, model_name=model_name)
+
+    return results
+
+
+class LLMCache:
+    """
+    Persistent cache of LLM verdicts, keyed by a semantic fingerprint.
+
+    Re-running a validation (prompt tweaks elsewhere, report regeneration,
+    CI retries) repays one Gemini round-trip per test case even when nothing
+    the model sees has changed. The fingerprint hashes the inputs that shape
+    the prompt and the response — scenario, test case, geometry, NFZ set,
+    the raw scenario data the prompt builders read (metrics, policies,
+    economic parameters), model name — so a hit is safe to replay and any
+    change to those inputs misses naturally. Backed by a single-table
+    SQLite file.
+    """
+
+    DEFAULT_PATH = Path.home() / '.cache' / 'lae_gpt' / 'llm_cache.sqlite'
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        path = Path(cache_path) if cache_path else self.DEFAULT_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS kv ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' created_at REAL NOT NULL)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def fingerprint(scenario_id: str, tc: TestCase, nfzs: List[NFZConfig],
+                    model_name: str, raw_data: Dict) -> str:
+        """SHA-256 over a canonical (sort_keys) JSON encoding of the inputs."""
+        payload = {
+            'scenario_id': scenario_id,
+            # The operational scenarios' prompts are built largely from the
+            # raw scenario file (metrics, policies, economic parameters),
+            # so editing it must invalidate the key even when the id,
+            # geometry and descriptions are untouched; a digest keeps the
+            # payload small
+            'raw_data_digest': hashlib.sha256(
+                json.dumps(raw_data, sort_keys=True, default=str).encode('utf-8')
+            ).hexdigest(),
+            'test_id': tc.test_id,
+            'command': tc.command,
+            'description': tc.description,
+            'start': [tc.start_position.north, tc.start_position.east,
+                      tc.start_position.down],
+            'target': [tc.target_position.north, tc.target_position.east,
+                       tc.target_position.down],
+            'waivers_enabled': tc.waivers_enabled,
+            'simulated_time': tc.simulated_time,
+            'nfzs': [[n.nfz_id, n.nfz_type, n.center_north, n.center_east,
+                      n.center_down, n.radius, n.safety_margin, n.height_min,
+                      n.height_max, n.zone_type, n.action] for n in nfzs],
+            'model': model_name,
+        }
+        blob = json.dumps(payload, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(blob).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict, str]]:
+        """Return the cached (decision, analysis, reasoning), or None."""
+        row = self._conn.execute(
+            'SELECT value FROM kv WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            decision, analysis, reasoning = _loads(row[0])
+        except (ValueError, TypeError):
+            return None  # Corrupt entry: treat as a miss, it will be rewritten
+        return decision, analysis, reasoning
+
+    def put(self, key: str, decision: str, analysis: Dict, reasoning: str) -> None:
+        value = json.dumps([decision, analysis, reasoning], ensure_ascii=False)
+        self._conn.execute(
+            'INSERT OR REPLACE INTO kv VALUES (?, ?, ?)',
+            (key, value, time.time()))
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
 # ============================================================================
 # SECTION 5: Configuration Loading
 # ============================================================================
 
+# Compiled once; strip_json_comments runs per scenario file loaded
+_LINE_COMMENT_RE = re.compile(r'//.*?$', re.MULTILINE)
+_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+# Fallback command parser, applied to every test case without explicit
+# geometry; compiled once instead of per command
+_MOVE_TO_POSITION_RE = re.compile(
+    r'move_to_position(?:_with_velocity)?\s*\(\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)')
+
+
 def strip_json_comments(text: str) -> str:
     """Remove JavaScript-style comments from JSON."""
-    import re
-    text = re.sub(r'//.*?$', '', text, flags=re.MULTILINE)
-    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
-    return text
+    return _BLOCK_COMMENT_RE.sub('', _LINE_COMMENT_RE.sub('', text))
+
+
+# Some scenarios name the per-test-case target differently; this table maps
+# the S### token to (required field, extractor returning the target dict, or
+# None to skip the test case). One schema-driven branch replaces four
+# special-case copies, and adding a scenario is a one-line change.
+_TARGET_EXTRACTORS = {
+    # S019 (airspace) - targets array; use first target for now
+    # (could extend to multi-target later)
+    'S019': ('targets', lambda tc: tc['targets'][0] if tc['targets'] else None),
+    # S018 (multi-drone) - commands array
+    'S018': ('commands',
+             lambda tc: tc['commands'][0].get('target', {}) if tc['commands'] else None),
+    # S020 (timeline) - target field
+    'S020': ('target', lambda tc: tc['target']),
+    # S021 (battery), S022 (rule_conflict), S023 (regulation_update) and
+    # S032 (dynamic_environment) - target_location field
+    'S021': ('target_location', lambda tc: tc['target_location']),
+    'S022': ('target_location', lambda tc: tc['target_location']),
+    'S023': ('target_location', lambda tc: tc['target_location']),
+    'S032': ('target_location', lambda tc: tc['target_location']),
+}
 
 
 def load_scenario_config(scenario_file: Path) -> Dict[str, Any]:
     """Load scenario configuration."""
+    # Strip and parse in one expression so neither the raw text nor the
+    # comment-stripped copy stays referenced once the dict exists; for large
+    # scenario files that keeps peak memory at one transient copy instead of
+    # pinning both strings for the rest of the load.
     with open(scenario_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    content_no_comments = strip_json_comments(content)
-    data = json.loads(content_no_comments)
-    
+        data = _loads(strip_json_comments(f.read()))
+
     llm_only = data.get('llm_only', False)
 
     # Parse NFZs
@@ -509,12 +830,13 @@ def load_scenario_config(scenario_file: Path) -> Dict[str, Any]:
             continue
         
         center = gf.get('center', {}).get('xyz', '0.0 0.0 0.0').split()
+        center_north, center_east, center_down = map(float, center[:3])
         nfz = NFZConfig(
             nfz_id=gf.get('id', ''),
             nfz_type=gf.get('type', 'cylinder'),
-            center_north=float(center[0]),
-            center_east=float(center[1]),
-            center_down=float(center[2]),
+            center_north=center_north,
+            center_east=center_east,
+            center_down=center_down,
             radius=gf.get('radius', 0.0),
             safety_margin=gf.get('safety_margin', 0.0),
             height_min=gf.get('height_min', -1000.0),
@@ -532,7 +854,32 @@ def load_scenario_config(scenario_file: Path) -> Dict[str, Any]:
     
     # Detect scenario type for special parsing
     scenario_id = data.get('id', '')
-    
+
+    # Every branch below that lacks an explicit start position falls back to
+    # actors[0].origin; parse it once per scenario instead of re-splitting
+    # the same xyz string for every test case.
+    default_start = (0.0, 0.0, 50.0)  # (north, east, altitude) fallback
+    actors = data.get('actors', [])
+    if actors:
+        xyz_str = actors[0].get('origin', {}).get('xyz', '0.0 0.0 -50.0')
+        try:
+            parts = xyz_str.split()
+            if len(parts) >= 3:
+                # NED: down is negative altitude
+                default_start = (float(parts[0]), float(parts[1]), -float(parts[2]))
+        except Exception:
+            pass  # Use default on parse error
+
+    # Resolve the scenario's special target schema (if any) once, through
+    # the same cached token parse the classifier uses, so the ID is
+    # uppercased a single time per distinct scenario rather than per caller
+    target_field = extract_target = None
+    idx = _scenario_index(scenario_id)
+    if idx >= 0:
+        schema = _TARGET_EXTRACTORS.get(f'S{idx:03d}')
+        if schema is not None:
+            target_field, extract_target = schema
+
     test_cases = []
     for tc in test_cases_data:
         # Try to get positions from explicit fields first
@@ -564,116 +911,23 @@ def load_scenario_config(scenario_file: Path) -> Dict[str, Any]:
             start = Position3D(north=start_n, east=start_e, down=-start_alt)
             target = Position3D(north=target_n, east=target_e, down=-target_alt)
         
-        # Special handling for S019 (airspace) - uses targets array
-        elif 'S019' in scenario_id.upper() and 'targets' in tc:
-            targets = tc.get('targets', [])
-            if targets and len(targets) > 0:
-                # Use first target for now (could extend to multi-target later)
-                first_target = targets[0]
-                target_n = first_target.get('north', 0.0)
-                target_e = first_target.get('east', 0.0)
-                target_alt = first_target.get('altitude', 50.0)
-                
-                # Get start from actors
-                start_n, start_e, start_alt = 0.0, 0.0, 50.0
-                actors = data.get('actors', [])
-                if actors and len(actors) > 0:
-                    origin = actors[0].get('origin', {})
-                    xyz_str = origin.get('xyz', '0.0 0.0 -50.0')
-                    try:
-                        parts = xyz_str.split()
-                        if len(parts) >= 3:
-                            start_n = float(parts[0])
-                            start_e = float(parts[1])
-                            start_alt = -float(parts[2])
-                    except:
-                        pass
-                
-                start = Position3D(north=start_n, east=start_e, down=-start_alt)
-                target = Position3D(north=target_n, east=target_e, down=-target_alt)
-            else:
-                continue
-        
-        # Special handling for S018 (multi-drone) - uses commands array
-        elif 'S018' in scenario_id.upper() and 'commands' in tc:
-            commands = tc.get('commands', [])
-            if commands and len(commands) > 0:
-                first_cmd = commands[0]
-                target_data = first_cmd.get('target', {})
-                target_n = target_data.get('north', 0.0)
-                target_e = target_data.get('east', 0.0)
-                target_alt = target_data.get('altitude', 50.0)
-                
-                # Get start from actors
-                start_n, start_e, start_alt = 0.0, 0.0, 50.0
-                actors = data.get('actors', [])
-                if actors and len(actors) > 0:
-                    origin = actors[0].get('origin', {})
-                    xyz_str = origin.get('xyz', '0.0 0.0 -50.0')
-                    try:
-                        parts = xyz_str.split()
-                        if len(parts) >= 3:
-                            start_n = float(parts[0])
-                            start_e = float(parts[1])
-                            start_alt = -float(parts[2])
-                    except:
-                        pass
-                
-                start = Position3D(north=start_n, east=start_e, down=-start_alt)
-                target = Position3D(north=target_n, east=target_e, down=-target_alt)
-            else:
+        # Special handling for scenarios with their own target schema
+        # (S018-S023, S032); the field name and extractor were resolved
+        # from the table above
+        elif target_field is not None and target_field in tc:
+            target_data = extract_target(tc)
+            if target_data is None:
                 continue
-        
-        # Special handling for S020 (timeline) - uses target field
-        elif 'S020' in scenario_id.upper() and 'target' in tc:
-            target_data = tc.get('target', {})
             target_n = target_data.get('north', 0.0)
             target_e = target_data.get('east', 0.0)
             target_alt = target_data.get('altitude', 50.0)
-            
-            # Get start from actors
-            start_n, start_e, start_alt = 0.0, 0.0, 50.0
-            actors = data.get('actors', [])
-            if actors and len(actors) > 0:
-                origin = actors[0].get('origin', {})
-                xyz_str = origin.get('xyz', '0.0 0.0 -50.0')
-                try:
-                    parts = xyz_str.split()
-                    if len(parts) >= 3:
-                        start_n = float(parts[0])
-                        start_e = float(parts[1])
-                        start_alt = -float(parts[2])
-                except:
-                    pass
-            
-            start = Position3D(north=start_n, east=start_e, down=-start_alt)
-            target = Position3D(north=target_n, east=target_e, down=-target_alt)
-        
-        # Special handling for S021 (battery), S022 (rule_conflict), S023 (regulation_update), and S032 (dynamic_environment) - uses target_location field
-        elif ('S021' in scenario_id.upper() or 'S022' in scenario_id.upper() or 'S023' in scenario_id.upper() or 'S032' in scenario_id.upper()) and 'target_location' in tc:
-            target_data = tc.get('target_location', {})
-            target_n = target_data.get('north', 0.0)
-            target_e = target_data.get('east', 0.0)
-            target_alt = target_data.get('altitude', 50.0)
-            
-            # Get start from actors
-            start_n, start_e, start_alt = 0.0, 0.0, 50.0
-            actors = data.get('actors', [])
-            if actors and len(actors) > 0:
-                origin = actors[0].get('origin', {})
-                xyz_str = origin.get('xyz', '0.0 0.0 -50.0')
-                try:
-                    parts = xyz_str.split()
-                    if len(parts) >= 3:
-                        start_n = float(parts[0])
-                        start_e = float(parts[1])
-                        start_alt = -float(parts[2])
-                except:
-                    pass
-            
+
+            # Start from actors[0].origin, parsed once above
+            start_n, start_e, start_alt = default_start
+
             start = Position3D(north=start_n, east=start_e, down=-start_alt)
             target = Position3D(north=target_n, east=target_e, down=-target_alt)
-        
+
         elif llm_only:
             # LLM-only scenarios may not provide explicit geometry;
             # use neutral origin to keep pipeline consistent.
@@ -682,9 +936,8 @@ def load_scenario_config(scenario_file: Path) -> Dict[str, Any]:
             target = Position3D(north=0.0, east=0.0, down=-default_altitude)
         else:
             # Fallback: Extract target from command
-            import re
-            match = re.search(r'move_to_position(?:_with_velocity)?\s*\(\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)', tc.get('command', ''))
-            
+            match = _MOVE_TO_POSITION_RE.search(tc.get('command', ''))
+
             if not match:
                 continue
                 
@@ -692,20 +945,8 @@ def load_scenario_config(scenario_file: Path) -> Dict[str, Any]:
             target_e = float(match.group(2))
             target_alt = float(match.group(3))
             
-            # Try to extract real start position from actors[0].origin
-            start_n, start_e, start_alt = 0.0, 0.0, 50.0  # Default fallback
-            actors = data.get('actors', [])
-            if actors and len(actors) > 0:
-                origin = actors[0].get('origin', {})
-                xyz_str = origin.get('xyz', '0.0 0.0 -50.0')
-                try:
-                    parts = xyz_str.split()
-                    if len(parts) >= 3:
-                        start_n = float(parts[0])
-                        start_e = float(parts[1])
-                        start_alt = -float(parts[2])  # NED: down is negative altitude
-                except:
-                    pass  # Use default on parse error
+            # Real start position from actors[0].origin, parsed once above
+            start_n, start_e, start_alt = default_start
             
             start = Position3D(north=start_n, east=start_e, down=-start_alt)
             target = Position3D(north=target_n, east=target_e, down=-target_alt)
@@ -750,13 +991,155 @@ def load_ground_truth(gt_file: Path) -> Dict[str, Any]:
         return json.load(f)
 
 
+class _ThreadLocalStdout:
+    """
+    stdout proxy routing each worker thread's prints to its own buffer.
+
+    contextlib.redirect_stdout swaps sys.stdout process-wide, so concurrent
+    workers would interleave into one capture; binding the buffer to the
+    thread keeps each test case's progress output separable so it can be
+    replayed in case order.
+    """
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self._local = threading.local()
+
+    def capture(self, buf: io.StringIO) -> None:
+        self._local.buf = buf
+
+    def release(self) -> None:
+        self._local.buf = None
+
+    def write(self, s: str) -> int:
+        buf = getattr(self._local, 'buf', None)
+        return (buf if buf is not None else self.fallback).write(s)
+
+    def flush(self) -> None:
+        buf = getattr(self._local, 'buf', None)
+        (buf if buf is not None else self.fallback).flush()
+
+
+def _resolve_cached_verdicts(config: Dict, model_name: str,
+                             cache: Optional[LLMCache]):
+    """
+    Split the test cases into cache hits and misses.
+
+    Returns (verdicts, keys, misses): a test-case-ordered verdict list with
+    hits filled in as (decision, analysis, reasoning, True), each case's
+    fingerprint (None without a cache), and the indices still needing a
+    Gemini call.
+    """
+    test_cases = config['test_cases']
+    verdicts: List[Optional[Tuple[str, Dict, str, bool]]] = [None] * len(test_cases)
+    keys: List[Optional[str]] = [None] * len(test_cases)
+    misses = []
+    for i, tc in enumerate(test_cases):
+        if cache is not None:
+            keys[i] = LLMCache.fingerprint(
+                config['scenario_id'], tc, config['nfzs'], model_name,
+                config['raw_data'])
+            hit = cache.get(keys[i])
+            if hit is not None:
+                verdicts[i] = (*hit, True)
+                continue
+        misses.append(i)
+    return verdicts, keys, misses
+
+
+def _fetch_verdicts_parallel(config: Dict, api_key: str, model_name: str,
+                             cache: Optional[LLMCache], workers: int):
+    """
+    Resolve all test-case verdicts with up to `workers` concurrent Gemini calls.
+
+    Test cases are independent and each call is dominated by the network
+    round-trip, so K cache misses cost ~ceil(K / workers) round-trips
+    instead of K. Cache lookups and stores stay on the calling thread (the
+    sqlite3 connection is bound to it); only the misses are fanned out.
+
+    Returns two test-case-ordered lists: (decision, analysis, reasoning,
+    from_cache) tuples and each case's captured progress output.
+    """
+    test_cases = config['test_cases']
+    verdicts, keys, misses = _resolve_cached_verdicts(config, model_name, cache)
+    outputs = [''] * len(test_cases)
+
+    if misses:
+        proxy = _ThreadLocalStdout(sys.stdout)
+
+        def run_case(i):
+            tc = test_cases[i]
+            buf = io.StringIO()
+            proxy.capture(buf)
+            try:
+                verdict = check_compliance_llm(
+                    tc.start_position, tc.target_position, config['nfzs'],
+                    tc.description, config, config['scenario_id'], api_key,
+                    tc, model_name=model_name)
+            finally:
+                proxy.release()
+            return verdict, buf.getvalue()
+
+        original_stdout = sys.stdout
+        sys.stdout = proxy
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fetched = list(executor.map(run_case, misses))
+        finally:
+            sys.stdout = original_stdout
+
+        for i, (verdict, captured) in zip(misses, fetched):
+            decision, analysis, reasoning = verdict
+            verdicts[i] = (decision, analysis, reasoning, False)
+            outputs[i] = captured
+            if keys[i] is not None and decision != 'ERROR':
+                cache.put(keys[i], decision, analysis, reasoning)
+
+    return verdicts, outputs
+
+
+def _fetch_verdicts_batched(config: Dict, api_key: str, model_name: str,
+                            cache: Optional[LLMCache], batch_size: int):
+    """
+    Resolve all test-case verdicts via multi-case batch prompts.
+
+    Cache hits are served locally; the misses go through
+    check_compliance_llm_batch_prompt, batch_size cases per Gemini request.
+    Returns the same (verdicts, outputs) pair as _fetch_verdicts_parallel;
+    batch progress prints directly, so the per-case outputs are empty.
+    """
+    test_cases = config['test_cases']
+    verdicts, keys, misses = _resolve_cached_verdicts(config, model_name, cache)
+
+    if misses:
+        fetched = check_compliance_llm_batch_prompt(
+            [test_cases[i] for i in misses], config['nfzs'], config,
+            config['scenario_id'], api_key, model_name=model_name,
+            batch_size=batch_size)
+        for i in misses:
+            decision, analysis, reasoning = fetched[test_cases[i].test_id]
+            verdicts[i] = (decision, analysis, reasoning, False)
+            if keys[i] is not None and decision != 'ERROR':
+                cache.put(keys[i], decision, analysis, reasoning)
+
+    return verdicts, [''] * len(test_cases)
+
+
 # ============================================================================
 # SECTION 6: LLM Validation (Ground Truth Comparison Only)
 # ============================================================================
 
-def validate_scenario(scenario_file: Path, ground_truth_file: Path, api_key: str, output_file: Path, model_name: str = 'gemini-2.5-flash', throttle_seconds: float = 0.0):
+def validate_scenario(scenario_file: Path, ground_truth_file: Path, api_key: str, output_file: Path, model_name: str = 'gemini-2.5-flash', throttle_seconds: float = 0.0, cache: Optional[LLMCache] = None, workers: int = 1, batch_size: int = 1):
     """
     Run LLM validation on scenario and compare with rule-based engine.
+
+    When a cache is supplied, test cases whose semantic fingerprint already
+    has a stored verdict skip the Gemini call (and the throttle sleep).
+    With workers > 1 the independent test cases are checked concurrently,
+    overlapping the network round-trips; per-case output is still printed
+    in order, replayed from per-thread captures. With batch_size > 1,
+    batch_size cases are packed into each Gemini request instead (takes
+    precedence over workers).
     """
     # Load configuration first to get scenario ID
     print("Loading scenario configuration...")
@@ -801,9 +1184,19 @@ def validate_scenario(scenario_file: Path, ground_truth_file: Path, api_key: str
     print(f"✓ Ground truth loaded: {len(gt_cases)} test cases")
     print()
     
+    # With batching or multiple workers, resolve every verdict up front so
+    # the round-trips amortize; the loop below then only formats and scores.
+    prefetched = prefetched_output = None
+    if batch_size > 1:
+        prefetched, prefetched_output = _fetch_verdicts_batched(
+            config, api_key, model_name, cache, batch_size)
+    elif workers > 1:
+        prefetched, prefetched_output = _fetch_verdicts_parallel(
+            config, api_key, model_name, cache, workers)
+
     # Validate each test case
     results = []
-    
+
     for i, tc in enumerate(config['test_cases'], 1):
         print(f"\n{'='*70}")
         print(f"Test Case {i}/{len(config['test_cases'])}: {tc.test_id}")
@@ -820,17 +1213,38 @@ def validate_scenario(scenario_file: Path, ground_truth_file: Path, api_key: str
         
         # LLM engine
         print("\n🤖 LLM Analysis (Gemini):")
-        llm_decision, llm_analysis, llm_reasoning = check_compliance_llm(
-            tc.start_position,
-            tc.target_position,
-            config['nfzs'],
-            tc.description,
-            config,  # Full scenario config for scenario-specific extraction
-            config['scenario_id'],  # For scenario type classification
-            api_key,
-            tc,  # Pass test case object for waiver info (S014)
-            model_name=model_name
-        )
+        cache_key = cached = None
+        if prefetched is not None:
+            llm_decision, llm_analysis, llm_reasoning, from_cache = prefetched[i - 1]
+            if prefetched_output[i - 1]:
+                print(prefetched_output[i - 1], end='')
+            if from_cache:
+                cached = True
+                print("   💾 Cached verdict (no API call)")
+        else:
+            if cache is not None:
+                cache_key = LLMCache.fingerprint(
+                    config['scenario_id'], tc, config['nfzs'], model_name,
+                    config['raw_data'])
+                cached = cache.get(cache_key)
+            if cached is not None:
+                llm_decision, llm_analysis, llm_reasoning = cached
+                print("   💾 Cached verdict (no API call)")
+            else:
+                llm_decision, llm_analysis, llm_reasoning = check_compliance_llm(
+                    tc.start_position,
+                    tc.target_position,
+                    config['nfzs'],
+                    tc.description,
+                    config,  # Full scenario config for scenario-specific extraction
+                    config['scenario_id'],  # For scenario type classification
+                    api_key,
+                    tc,  # Pass test case object for waiver info (S014)
+                    model_name=model_name
+                )
+                # Only successful verdicts are worth replaying
+                if cache_key is not None and llm_decision != 'ERROR':
+                    cache.put(cache_key, llm_decision, llm_analysis, llm_reasoning)
         print(f"   Decision: {llm_decision}")
         print(f"   Reasoning: {llm_reasoning}")
         
@@ -903,8 +1317,9 @@ def validate_scenario(scenario_file: Path, ground_truth_file: Path, api_key: str
         }
         results.append(result)
 
-        # Optional throttle to avoid rate limiting
-        if throttle_seconds > 0 and i < len(config['test_cases']):
+        # Optional throttle to avoid rate limiting; pointless after a cache
+        # hit or when the calls already went out through the worker pool
+        if throttle_seconds > 0 and prefetched is None and cached is None and i < len(config['test_cases']):
             time.sleep(throttle_seconds)
     
     # Summary
@@ -970,7 +1385,16 @@ def main():
                         help='Gemini model name (default: gemini-2.5-flash)')
     parser.add_argument('--throttle-seconds', type=float, default=0.0,
                         help='Optional sleep between test cases to avoid rate limits')
-    
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Concurrent Gemini calls (1 = sequential)')
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help='Test cases per Gemini request (1 = one call per case; '
+                             'takes precedence over --workers)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Disable the persistent LLM verdict cache')
+    parser.add_argument('--cache-path', type=str, default=None,
+                        help=f'LLM cache file (default: {LLMCache.DEFAULT_PATH})')
+
     args = parser.parse_args()
     
     # Get API key
@@ -992,16 +1416,25 @@ def main():
         print(f"ERROR: Ground truth file not found: {ground_truth_file}")
         return 1
     
+    cache = None if args.no_cache else LLMCache(args.cache_path)
+
     # Run validation
-    success = validate_scenario(
-        scenario_file,
-        ground_truth_file,
-        api_key,
-        output_file,
-        model_name=args.model,
-        throttle_seconds=args.throttle_seconds
-    )
-    
+    try:
+        success = validate_scenario(
+            scenario_file,
+            ground_truth_file,
+            api_key,
+            output_file,
+            model_name=args.model,
+            throttle_seconds=args.throttle_seconds,
+            cache=cache,
+            workers=args.workers,
+            batch_size=args.batch_size
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+
     return 0 if success else 1
 
 
@@ -58,6 +58,13 @@ class ValidationResult:
         return self.valid
 
 
+# Comment-stripping patterns compiled once at import instead of per call;
+# validation sweeps every scenario file, so the per-call compile-cache
+# probes add up.
+_LINE_COMMENT_RE = re.compile(r'//.*?$', re.MULTILINE)
+_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+
 def strip_json_comments(text: str) -> str:
     """
     Remove JavaScript-style comments from JSON content.
@@ -73,12 +80,10 @@ def strip_json_comments(text: str) -> str:
         JSON text without comments
     """
     # Remove single-line comments
-    text = re.sub(r'//.*?$', '', text, flags=re.MULTILINE)
-    
+    text = _LINE_COMMENT_RE.sub('', text)
+
     # Remove multi-line comments
-    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
-    
-    return text
+    return _BLOCK_COMMENT_RE.sub('', text)
 
 
 def load_jsonc(file_path: Path) -> Tuple[Optional[Dict[str, Any]], Optional[str]]: